@@ -0,0 +1,127 @@
+"""Benchmark suite timing each stage of the docstring pipeline on synthetic corpora.
+
+Each stage is timed separately on modules of 1k, 10k and 100k functions, the best of several repeats is kept. Results
+are stored as json in benchmarks/results, one file per git commit, so that a run can be compared with the results of a
+previous commit to catch regressions. Run with `python -m benchmarks [--sizes 1000 10000] [--compare REF]`."""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from docstring_format.base import (Docstring, ScriptFile, get_docstring_start_and_length, get_functions,
+                                   parse_sections)
+from docstring_format.numpy_style import apply_numpy_style
+
+from .corpus import generate_module
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+REGRESSION_THRESHOLD = 0.1  # relative slowdown reported as a regression
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Best wall time of func over repeat runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def time_stages(n_functions: int, repeat: int) -> dict[str, float]:
+    """Time each stage of the pipeline on a module of n_functions functions.
+
+    Each stage is fed with the output of the previous ones, computed once beforehand, so that only its own work is
+    timed. ScriptFile.cleaned is timed end to end on a new ScriptFile each time, its result being memoized."""
+    raw_text = generate_module(n_functions)
+    lines = raw_text.splitlines()
+    functions = get_functions(raw_text)
+    docstrings = [Docstring.from_ast(func, lines) for func in functions]
+    sections = [section for docstring in docstrings for section in docstring.sections]
+
+    return {
+        'get_functions': best_time(lambda: get_functions(raw_text), repeat),
+        'get_docstring_start_and_length': best_time(
+            lambda: [get_docstring_start_and_length(func, lines) for func in functions], repeat),
+        'parse_sections': best_time(lambda: [parse_sections(docstring.function, docstring.lines, lines)
+                                             for docstring in docstrings], repeat),
+        'apply_numpy_style': best_time(lambda: [apply_numpy_style(section) for section in sections], repeat),
+        'ScriptFile.cleaned': best_time(lambda: ScriptFile('module.py', raw_text).cleaned, repeat),
+    }
+
+
+def git_revision(ref: str = 'HEAD', working_tree: bool = False) -> str:
+    """Commit sha of ref. With working_tree, a `-dirty` suffix is added when the tree holds uncommitted changes."""
+    def git(*args) -> str:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+
+    sha = git('rev-parse', '--short', ref)
+    if working_tree and git('status', '--porcelain', '--untracked-files=no'):
+        sha += '-dirty'
+    return sha
+
+
+def load_results(revision: str) -> Optional[dict]:
+    """Results stored for a revision, None if the suite was not run on it."""
+    path = RESULTS_DIR / f'{revision}.json'
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def compare(results: dict, reference: dict) -> list[str]:
+    """Print the ratio of each timing to the reference and return the stages slower beyond the threshold."""
+    regressions = []
+    print(f'\ncompared with {reference["revision"]}')
+    for size, timings in results['timings'].items():
+        for stage, seconds in timings.items():
+            previous = reference['timings'].get(size, {}).get(stage)
+            if previous is None:
+                continue
+            ratio = seconds / previous
+            flag = ''
+            if ratio > 1 + REGRESSION_THRESHOLD:
+                flag = '  <- regression'
+                regressions.append(f'{stage} ({size} functions)')
+            print(f'{size:>9} {stage:<32} {ratio:6.2f}x{flag}')
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='numbers of functions')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compare', metavar='REF', help='git revision whose stored results are compared')
+    parser.add_argument('--no-save', action='store_true', help='do not store the results')
+    args = parser.parse_args(argv)
+
+    revision = git_revision(working_tree=True)
+    results = {'revision': revision, 'python': platform.python_version(), 'timings': {}}
+    print(f'{"functions":>9} {"stage":<32} {"time (ms)":>10}')
+    for size in args.sizes:
+        timings = time_stages(size, args.repeat)
+        results['timings'][str(size)] = timings
+        for stage, seconds in timings.items():
+            print(f'{size:>9} {stage:<32} {seconds * 1e3:10.2f}')
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        (RESULTS_DIR / f'{revision}.json').write_text(json.dumps(results, indent=4))
+
+    if args.compare is not None:
+        reference = load_results(git_revision(args.compare))
+        if reference is None:
+            print(f'no stored results for {args.compare}', file=sys.stderr)
+            return 1
+        regressions = compare(results, reference)
+        if regressions:
+            print(f'{len(regressions)} regression(s): {", ".join(regressions)}', file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Benchmark the location of docstrings in the script lines.
+
+Run with `python -m benchmarks.bench_locator`."""
+import ast
+import timeit
+
+from docstring_format.base import get_docstring_start_and_length, get_functions
+from docstring_format.utils import DOCSTRING_TAGS_REGEX
+
+from .corpus import generate_module
+
+
+def legacy_start_and_length(func: ast.FunctionDef, raw_text: list[str]) -> tuple[int, int]:
+    """Former implementation, scanning lines forward for the triple quotes."""
+    docstring = ast.get_docstring(func)
+    tag_search = DOCSTRING_TAGS_REGEX['generic']
+
+    def get_tag_from(index, offset=0):
+        match = tag_search.search(raw_text[index + offset])
+        while not match:
+            index += 1
+            match = tag_search.search(raw_text[index + offset])
+        return index
+
+    start = get_tag_from(func.lineno - 1)
+    length = get_tag_from(len(docstring.splitlines()), offset=start - 1)
+    return start, length
+
+
+def main(n_functions: int = 10_000, number: int = 5):
+    raw_text = generate_module(n_functions)
+    lines = raw_text.splitlines()
+    functions = get_functions(raw_text)
+    assert ([legacy_start_and_length(func, lines) for func in functions] ==
+            [get_docstring_start_and_length(func, lines) for func in functions])
+
+    legacy = min(timeit.repeat(lambda: [legacy_start_and_length(func, lines) for func in functions],
+                               number=number, repeat=3)) / number
+    positions = min(timeit.repeat(lambda: [get_docstring_start_and_length(func, lines) for func in functions],
+                                  number=number, repeat=3)) / number
+    print(f'{n_functions} functions')
+    print(f'regex scan    : {legacy * 1e3:8.2f} ms')
+    print(f'ast positions : {positions * 1e3:8.2f} ms ({legacy / positions:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
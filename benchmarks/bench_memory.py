@@ -0,0 +1,77 @@
+"""Benchmark the memory held by the docstring records of a script.
+
+Run with `python -m benchmarks.bench_memory`."""
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Optional
+
+from docstring_format import Docstring
+from docstring_format.base import get_functions
+from docstring_format.utils import SectionType
+
+from .corpus import generate_module
+
+
+@dataclass
+class LegacySection:
+    """Former section record, a regular dataclass holding a copy of its lines."""
+    name: str
+    type: SectionType
+    start: Optional[int] = None
+    length: Optional[int] = None
+    offset: Optional[str] = None
+    lines: Optional[list[str]] = None
+    annotation: Optional[str] = None
+
+
+@dataclass
+class LegacyDocstring:
+    """Former docstring record, a regular dataclass holding a copy of its lines."""
+    function: object
+    lines: list[str]
+    start: int
+    length: int
+    offset: str = field(init=False)
+    sections: list[LegacySection] = field(init=False)
+
+
+def copy_str(text: Optional[str]) -> Optional[str]:
+    """Distinct copy of text, indentations used not to be interned."""
+    return text if text is None else ''.join(list(text))
+
+
+def legacy_docstring(func, lines: list[str]) -> LegacyDocstring:
+    """Docstring record as built before, the lines of the docstring and of each section are copied."""
+    docstring = Docstring.from_ast(func, lines)
+    legacy = LegacyDocstring(func, list(docstring.lines), docstring.start, docstring.length)
+    legacy.offset = copy_str(docstring.offset)
+    legacy.sections = [LegacySection(section.name, section.type, section.start, section.length,
+                                     copy_str(section.offset), list(section.lines), section.annotation)
+                       for section in docstring.sections]
+    return legacy
+
+
+def retained_memory(build, functions, lines) -> int:
+    """Memory held by the records built for all functions, in bytes."""
+    tracemalloc.start()
+    records = [build(func, lines) for func in functions]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main(n_functions: int = 10_000):
+    raw_text = generate_module(n_functions)
+    lines = raw_text.splitlines()
+    functions = get_functions(raw_text, with_docstring=True)
+
+    legacy = retained_memory(legacy_docstring, functions, lines)
+    views = retained_memory(Docstring.from_ast, functions, lines)
+    print(f'{n_functions} functions')
+    print(f'copied lines, dict records : {legacy / 2 ** 20:8.2f} Mb')
+    print(f'line views, slotted records: {views / 2 ** 20:8.2f} Mb ({1 - views / legacy:.0%} less)')
+
+
+if __name__ == '__main__':
+    main()
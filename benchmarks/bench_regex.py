@@ -0,0 +1,59 @@
+"""Micro-benchmark of the regex work done per docstring.
+
+The same searches are run once with raw pattern strings, as the cleaning functions used to do, and once through the
+precompiled patterns and the compile_pattern registry. Run with `python -m benchmarks.bench_regex`."""
+import re
+import timeit
+
+from docstring_format.numpy_style import CONSECUTIVE_BLANK_LINES, DASH_LINE, RETURNS_LINE
+from docstring_format.utils import DOCSTRING_TAGS, DOCSTRING_TAGS_REGEX, EMPTY_LINE, compile_pattern
+
+from .corpus import FUNCTION_TEMPLATE
+
+DOCSTRING = FUNCTION_TEMPLATE.split('"""')[1].splitlines()
+ARGUMENTS = {'arg1': 'str', 'arg2': 'Optional[Iterable]', 'values': 'Union[pd.DataFrame, pd.Series]'}
+
+
+def legacy_regex(lines: list[str]):
+    """Regex calls made on a docstring with pattern strings compiled on the fly."""
+    for token in [*ARGUMENTS, 'Parameters', 'Returns']:
+        pattern = re.compile(rf'^(\s*)({token})')
+        for line in lines:
+            re.search(pattern, line)
+    re.search(DOCSTRING_TAGS['first'], lines[0])
+    re.search(DOCSTRING_TAGS['last'], lines[-1])
+    re.sub(r'\n{3,}', '\n\n', '\n'.join(lines))
+    for name, annotation in ARGUMENTS.items():
+        re.search(re.compile(rf'{name}.*{annotation}[():\s_]*(.*)'), lines[0])
+        re.search(re.compile(rf'{name}[():\s_]*(.*)'), lines[0])
+    for line in lines:
+        re.search('[Rr]eturns?', line) or re.search('-+', line) or re.search(r'^\s*$', line)
+
+
+def registry_regex(lines: list[str]):
+    """Same regex calls made through precompiled patterns and the pattern registry."""
+    for token in [*ARGUMENTS, 'Parameters', 'Returns']:
+        pattern = compile_pattern(rf'^(\s*)({token})')
+        for line in lines:
+            pattern.search(line)
+    DOCSTRING_TAGS_REGEX['first'].search(lines[0])
+    DOCSTRING_TAGS_REGEX['last'].search(lines[-1])
+    CONSECUTIVE_BLANK_LINES.sub('\n\n', '\n'.join(lines))
+    for name, annotation in ARGUMENTS.items():
+        compile_pattern(rf'{name}.*{annotation}[():\s_]*(.*)').search(lines[0])
+        compile_pattern(rf'{name}[():\s_]*(.*)').search(lines[0])
+    for line in lines:
+        RETURNS_LINE.search(line) or DASH_LINE.search(line) or EMPTY_LINE.search(line)
+
+
+def main(number: int = 20_000):
+    legacy = min(timeit.repeat(lambda: legacy_regex(DOCSTRING), number=number, repeat=3)) / number
+    registry = min(timeit.repeat(lambda: registry_regex(DOCSTRING), number=number, repeat=3)) / number
+    print(f'regex overhead per docstring ({len(DOCSTRING)} lines, {len(ARGUMENTS)} arguments)')
+    print(f'pattern strings   : {legacy * 1e6:8.2f} us')
+    print(f'compiled patterns : {registry * 1e6:8.2f} us ({legacy / registry:.1f}x faster)')
+    print(compile_pattern.cache_info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Benchmark the rewrite of the cleaned docstrings into the script lines.
+
+Run with `python -m benchmarks.bench_splice`."""
+import tempfile
+import timeit
+from pathlib import Path
+
+from docstring_format import ScriptFile
+from docstring_format.base import splice
+
+from .corpus import generate_module_lines
+
+
+def legacy_cleaned(lines: list[str], edits: list[tuple[int, int, list[str]]]) -> list[str]:
+    """Former implementation of ScriptFile.cleaned, based on repeated list.pop and list.insert."""
+    cleaned = lines.copy()
+    offset = 0
+    for start, length, new_docstring in edits:
+        for _ in range(length):
+            cleaned.pop(start + offset)
+        for line in new_docstring[::-1]:
+            cleaned.insert(start + offset, line)
+        offset += len(new_docstring) - length
+    return cleaned
+
+
+def main(n_lines: int = 50_000, number: int = 5):
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = str(Path(directory) / 'generated.py')
+        Path(file_path).write_text(generate_module_lines(n_lines))
+        script = ScriptFile(file_path)
+
+    # docstrings are cleaned beforehand so that only the rewrite is timed
+    edits = list(script.edits)
+    lines = script.lines
+    assert legacy_cleaned(lines, edits) == [line for chunk in splice(lines, edits) for line in chunk]
+
+    legacy = min(timeit.repeat(lambda: legacy_cleaned(lines, edits), number=number, repeat=3)) / number
+    single_pass = min(timeit.repeat(lambda: [line for chunk in splice(lines, edits) for line in chunk],
+                                    number=number, repeat=3)) / number
+    print(f'{len(lines)} lines, {len(edits)} docstrings')
+    print(f'pop/insert  : {legacy * 1e3:8.2f} ms')
+    print(f'single pass : {single_pass * 1e3:8.2f} ms ({legacy / single_pass:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark the peak memory of the cleaning of large scripts, in memory and streamed.
+
+Run with `python -m benchmarks.bench_streaming`."""
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from docstring_format import ScriptFile
+from docstring_format.base import edit_path
+from docstring_format.streaming import write_clean_streaming
+
+from .corpus import generate_module
+
+
+def peak_memory(func, *args) -> int:
+    """Peak memory allocated by python while running func, in bytes."""
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(sizes: tuple[int, ...] = (1_000, 5_000, 20_000)):
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'{"functions":>10} {"file (Mb)":>10} {"in memory (Mb)":>15} {"streamed (Mb)":>15}')
+        for n_functions in sizes:
+            file_path = str(Path(directory) / f'generated_{n_functions}.py')
+            Path(file_path).write_text(generate_module(n_functions))
+            in_memory = peak_memory(lambda: ScriptFile(file_path).write_clean())
+            streamed = peak_memory(write_clean_streaming, file_path)
+            size = Path(file_path).stat().st_size
+            assert edit_path(file_path).read_text() == ScriptFile(file_path).cleaned_text
+            print(f'{n_functions:>10} {size / 2 ** 20:>10.1f} {in_memory / 2 ** 20:>15.1f} {streamed / 2 ** 20:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Generate synthetic python modules used by the benchmarks."""
+
+FUNCTION_TEMPLATE = '''
+
+def function_{n}(arg1: str, arg2: Optional[Iterable] = None, values: "Union[pd.DataFrame, pd.Series]" = None) -> dict:
+    """Compute something useful number {n}.
+
+
+    Second paragraph.
+    Parameters
+    ----------
+    arg1: first argument
+    arg2 (Optional[Iterable]): second argument
+    values: values to compute from
+
+    Returns
+    -------
+
+    """
+    result = {{'arg1': arg1, 'arg2': arg2}}
+    return result
+'''
+
+HEADER = '''from typing import Iterable, Optional, Union
+import pandas as pd
+'''
+
+
+def generate_module(n_functions: int) -> str:
+    """Source of a module made of n_functions documented functions."""
+    return HEADER + ''.join(FUNCTION_TEMPLATE.format(n=n) for n in range(n_functions))
+
+
+def generate_module_lines(n_lines: int) -> str:
+    """Source of a module of about n_lines lines."""
+    lines_per_function = FUNCTION_TEMPLATE.count('\n')
+    return generate_module(max(1, n_lines // lines_per_function))
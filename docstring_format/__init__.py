@@ -1,3 +1,32 @@
-from .annotation_parser import parse_annotation, parse_returns
-from .base import Docstring, DocstringSection, ScriptFile
-from .utils import DocstringStyle, SectionType
+"""Format docstrings of python scripts.
+
+Public objects are imported on first access, so that entry points which do not need them (command line help, daemon
+client) start without loading the parsing modules."""
+import importlib
+
+__version__ = '0.9.0'
+
+_LAZY_IMPORTS = {'parse_annotation': 'annotation_parser',
+                 'parse_returns': 'annotation_parser',
+                 'Docstring': 'base',
+                 'DocstringSection': 'base',
+                 'ScriptFile': 'base',
+                 'cleaned_stats': 'base',
+                 'format_many': 'runner',
+                 'DocstringStyle': 'utils',
+                 'SectionType': 'utils'}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    """Import public objects on first access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{_LAZY_IMPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_IMPORTS])
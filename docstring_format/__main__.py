@@ -1,11 +1,97 @@
-import typer
-from .base import ScriptFile
+import argparse
+import os
+import sys
+from typing import Optional
 
+from .utils import DEFAULT_CACHE_DIR, DocstringStyle
 
-def format(file_path: str):
-    script = ScriptFile(file_path)
-    script.write_clean()
+
+def format(paths: list[str], workers: Optional[int] = None, pattern: str = '*.py', cache: bool = True,
+           cache_dir: str = DEFAULT_CACHE_DIR, cache_size: int = 64, diff: Optional[str] = None,
+           lines: Optional[str] = None, check: bool = False, stream: bool = False, in_place: bool = False,
+           profile: bool = False, profile_top: int = 10, profile_json: Optional[str] = None,
+           style: str = 'numpy') -> int:
+    """Format the python scripts found in paths, directories are searched recursively.
+
+    Unchanged files are not parsed again thanks to a cache limited to cache_size Mb, use --no-cache to disable it.
+    With --diff REF, only the functions changed since the git revision REF are cleaned, --lines 10-20,35 does the same
+    with explicit line ranges. With --check, nothing is written and the functions whose docstring is not clean are
+    printed as json. --stream cleans very large scripts one docstring at a time, with a bounded memory. --in-place
+    replaces the scripts by their cleaned version instead of writing `_edit.py` files, clean scripts are not
+    rewritten. --profile prints the time spent per stage (io, parse, sections, cleaning) and the profile_top slowest
+    files on stderr, --profile-json PATH writes the full profile as json. Docstrings are detected as numpy, google or
+    rst and rendered in --style. Returns the exit code of the command line."""
+    docstring_style = DocstringStyle[style.upper()]
+
+    if profile or profile_json is not None:
+        from .profiling import enable
+        enable()  # before the pipeline is imported, so that its stages are timed
+
+    # modules are imported here rather than at module level to keep the startup of the command line light
+    from .runner import collect_files, format_files
+
+    file_paths = collect_files(paths, pattern)
+    clean_cache = None
+    if cache:
+        from .cache import CleanCache
+        clean_cache = CleanCache(cache_dir, max_size=cache_size * 2 ** 20, style=docstring_style)
+
+    line_ranges = None
+    if diff is not None:
+        from .diff import git_diff_ranges
+        line_ranges = git_diff_ranges(diff, paths)
+        file_paths = [file_path for file_path in file_paths if os.path.abspath(file_path) in line_ranges]
+    elif lines is not None:
+        from .diff import parse_line_ranges
+        line_ranges = {os.path.abspath(file_path): parse_line_ranges(lines) for file_path in file_paths}
+    reports = format_files(file_paths, workers, clean_cache, line_ranges, check, stream, in_place, docstring_style)
+
+    if profile or profile_json is not None:
+        from .profiling import format_summary, summarize
+        summary = summarize(reports)
+        if profile:
+            print(format_summary(summary, profile_top), file=sys.stderr)
+        if profile_json is not None:
+            import json
+            with open(profile_json, 'w') as file:
+                json.dump(summary, file, indent=4)
+
+    errors = [report for report in reports if not report.ok]
+    for report in errors:
+        print(f'{report.file_path}: {report.error}', file=sys.stderr)
+
+    if check:
+        import json
+        unclean = [report for report in reports if report.ok and not report.clean]
+        print(json.dumps([{'file': report.file_path, 'function': report.function, 'lineno': report.lineno}
+                          for report in unclean], indent=4))
+        print(f'{len(unclean)} file(s) to format, {len(errors)} error(s)', file=sys.stderr)
+        return 1 if unclean or errors else 0
+
+    print(f'{len(reports) - len(errors)} file(s) formatted, {len(errors)} error(s)')
+    return 1 if errors else 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point of the command line, argparse is used rather than typer to keep its startup light."""
+    parser = argparse.ArgumentParser(prog='docstring_format', description=format.__doc__.split('\n')[0])
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--pattern', default='*.py')
+    parser.add_argument('--cache', action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--cache-size', type=int, default=64, help='in Mb')
+    parser.add_argument('--diff', metavar='REF', help='only clean the functions changed since the git revision REF')
+    parser.add_argument('--lines', help='only clean the functions overlapping line ranges such as 10-20,35')
+    parser.add_argument('--check', action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument('--stream', action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument('--in-place', action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument('--profile', action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument('--profile-top', type=int, default=10)
+    parser.add_argument('--profile-json', metavar='PATH')
+    parser.add_argument('--style', default='numpy', choices=[style.name.lower() for style in DocstringStyle])
+    return format(**vars(parser.parse_args(argv)))
 
 
 if __name__ == '__main__':
-    typer.run(format)
+    sys.exit(main())
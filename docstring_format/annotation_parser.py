@@ -1,11 +1,10 @@
 """Module implementing the conversion of annotations ast object into string."""
 import ast
-from typing import Any, Optional
+import sys
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Union
 
-
-def eval_str(node) -> str:
-    """Evaluate string node"""
-    return node.s
+from .utils import ANNOTATION_CACHE_SIZE
 
 
 def eval_name(node) -> str:
@@ -13,53 +12,104 @@ def eval_name(node) -> str:
     return node.id
 
 
-def eval_index(node) -> str:
-    """Evaluate index node"""
-    return eval_node(node.value)
-
-
 def eval_tuple(node) -> str:
     """"Evaluate tuple node"""
     return ', '.join((eval_node(item) for item in node.elts))
 
 
+def eval_list(node) -> str:
+    """Evaluate list node, as found in `Callable[[int, str], bool]`"""
+    return f'[{eval_tuple(node)}]'
+
+
 def eval_attribute(node) -> str:
     """Evaluate attribute node"""
     return f'{eval_node(node.value)}.{node.attr}'
 
 
 def eval_constant(node) -> str:
-    """Evaluate constant node"""
-    return node.value
+    """Evaluate constant node, strings (forward references) are kept unquoted"""
+    if isinstance(node.value, str):
+        return node.value
+    return ast.unparse(node)
 
 
 def eval_subscript(node) -> str:
-    """Evaluate subscript node"""
-    return f'{eval_node(node.value)}[{eval_node(node.slice)}]'
+    """Evaluate subscript node, the values of a `Literal` are rendered as written, strings being kept quoted"""
+    value = eval_node(node.value)
+    if value == 'Literal' or value.endswith('.Literal'):
+        items = node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+        return f'{value}[{", ".join(ast.unparse(item) for item in items)}]'
+    return f'{value}[{eval_node(node.slice)}]'
 
 
-def eval_node(node: Any) -> str:
-    """Entry point for the graph walk"""
-    node_class = type(node)
-    return EVAL_MAP[node_class](node)
+def eval_binop(node) -> str:
+    """Evaluate binary operation node, as found in `int | None`"""
+    if isinstance(node.op, ast.BitOr):
+        return f'{eval_node(node.left)} | {eval_node(node.right)}'
+    return ast.unparse(node)
 
 
-def parse_annotation(item: ast.arg) -> Optional[str]:
-    """Parse annotations from an argument"""
+def eval_node(node: Any) -> str:
+    """Entry point for the graph walk, nodes without dedicated evaluation (calls...) are rendered as written"""
+    evaluate = EVAL_MAP.get(type(node))
+    if evaluate is None:
+        return ast.unparse(node)
+    return evaluate(node)
+
+
+def render(node: ast.expr) -> Optional[str]:
+    """Render an annotation node, a `None` annotation is rendered as None"""
+    if isinstance(node, ast.Constant) and node.value is None:
+        return None
+    return eval_node(node)
+
+
+@lru_cache(maxsize=ANNOTATION_CACHE_SIZE)
+def render_source(source: str) -> Optional[str]:
+    """Render an annotation from its source, renderings are interned as the same annotations repeat across files"""
+    rendered = render(ast.parse(source, mode='eval').body)
+    return rendered if rendered is None else sys.intern(rendered)
+
+
+def get_source_segment(node: ast.expr, lines: Sequence[str]) -> Optional[str]:
+    """Source of a node written on a single line, None otherwise. Node columns are offsets in utf-8 bytes."""
+    if node.lineno != node.end_lineno or node.lineno > len(lines):
+        return None
+    line = lines[node.lineno - 1]
+    if line.isascii():
+        return line[node.col_offset:node.end_col_offset]
+    return line.encode()[node.col_offset:node.end_col_offset].decode()
+
+
+def render_annotation(node: ast.expr, lines: Optional[Sequence[str]] = None) -> Optional[str]:
+    """Render an annotation node, through a cache keyed by its source when the lines of the script are given."""
+    source = get_source_segment(node, lines) if lines is not None else None
+    if source is None:
+        return render(node)
+    try:
+        return render_source(source)
+    except SyntaxError:  # lines do not match the node
+        return render(node)
+
+
+def parse_annotation(item: ast.arg, lines: Optional[Sequence[str]] = None) -> Optional[str]:
+    """Parse annotations from an argument, lines of the script enables the rendering cache"""
     if hasattr(item, 'annotation') and item.annotation:
-        return eval_node(item.annotation)
+        return render_annotation(item.annotation, lines)
 
 
-def parse_returns(item: ast.FunctionDef) -> Optional[str]:
-    """Parse the return item from the function definition"""
+def parse_returns(item: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+                  lines: Optional[Sequence[str]] = None) -> Optional[str]:
+    """Parse the return item from the function definition, lines of the script enables the rendering cache"""
     if hasattr(item, 'returns') and item.returns:
-        return eval_node(item.returns)
+        return render_annotation(item.returns, lines)
 
 
 EVAL_MAP = {ast.Name: eval_name,
             ast.Constant: eval_constant,
-            ast.Index: eval_index,
             ast.Tuple: eval_tuple,
+            ast.List: eval_list,
             ast.Attribute: eval_attribute,
             ast.Subscript: eval_subscript,
-            ast.Str: eval_str}
+            ast.BinOp: eval_binop}
@@ -1,196 +1,510 @@
 """Implements base objects for docstring cleaning."""
 import ast
+import os
 import re
-from dataclasses import dataclass, field
+import shutil
+import sys
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import IO, Callable, Iterable, Iterator, Optional, Sequence, TextIO, Union
 
 from .annotation_parser import parse_annotation, parse_returns
-from .numpy_style import apply_numpy_style
-from .utils import DELIMITERS, DOCSTRING_TAGS, DocstringStyle, SectionType
+from .numpy_style import sanitize
+from .profiling import stage
+from .styles import DEFAULT_STYLE, Style, detect_style, get_style
+from .utils import (LEADING_WHITESPACE, DocstringStyle, LineRange, LineView, SectionType, detect_newline, overlaps,
+                    split_lines)
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+# nodes whose body may hold a function definition
+STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
 
 
 @dataclass
-class DocstringSection:
-    """Implements docstring section"""
+class CacheStats:
+    """Hits and misses of the memoized cleaned results of a kind of record."""
+    hits: int = 0
+    misses: int = 0
+
+
+CLEANED_STATS = {'section': CacheStats(), 'docstring': CacheStats(), 'script': CacheStats()}
+# records are cleaned from the handler threads of the daemon
+STATS_LOCK = threading.Lock()
+
+
+def cleaned_stats(reset: bool = False) -> dict[str, dict[str, int]]:
+    """Hits and misses of the cleaned results of sections, docstrings and scripts since the last reset."""
+    with STATS_LOCK:
+        stats = {kind: asdict(item) for kind, item in CLEANED_STATS.items()}
+        if reset:
+            for item in CLEANED_STATS.values():
+                item.hits = item.misses = 0
+    return stats
+
+
+class Generation:
+    """Counter of the modifications of records holding a memoized result."""
+    value = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def bump(cls):
+        with cls.lock:
+            cls.value += 1
+
+
+class Memoized:
+    """Records holding a memoized cleaned result.
+
+    The result is stored along with the arguments it was computed for and the generation of the records. Assigning
+    an attribute of a record whose result was computed starts a new generation, so that the results of the records
+    built from it (docstrings of a script, script of a docstring) are dropped too and a hit is checked in constant
+    time. Lines given as lists are stored as tuples, so that they cannot be modified in place."""
+    __slots__ = ('_memo',)
+
+    def __setattr__(self, name: str, value):
+        if name == 'lines' and isinstance(value, list):
+            value = tuple(value)
+        object.__setattr__(self, name, value)
+        if name != '_memo' and getattr(self, '_memo', None) is not None:
+            Generation.bump()
+
+    @staticmethod
+    def memo_key(*args) -> tuple:
+        """Key of a result computed for args from the records of the current generation."""
+        return (*args, Generation.value)
+
+    def get_memo(self, kind: str, key: tuple):
+        """Memoized result if it was computed for key, None otherwise."""
+        memo = getattr(self, '_memo', None)
+        hit = memo is not None and memo[0] == key
+        with STATS_LOCK:
+            if hit:
+                CLEANED_STATS[kind].hits += 1
+            else:
+                CLEANED_STATS[kind].misses += 1
+        return memo[1] if hit else None
+
+    def set_memo(self, key: tuple, result):
+        self._memo = (key, result)
+        return result
+
+
+@dataclass(slots=True)
+class DocstringSection(Memoized):
+    """Implements docstring section, lines is a view on the lines of the docstring."""
     name: str
     type: SectionType
     start: Optional[int] = None
     length: Optional[int] = None
     offset: Optional[str] = None
-    lines: Optional[list[str]] = None
+    lines: Optional[Sequence[str]] = None
     annotation: Optional[str] = None
 
+    def clean(self, style: DocstringStyle = DEFAULT_STYLE, source_style: DocstringStyle = DEFAULT_STYLE,
+              offset: Optional[str] = None) -> list[str]:
+        """Cleaned section rendered in style, from lines written in source_style.
+
+        offset is the indentation of the docstring, the one of the section by default. It is computed once until a
+        record is modified."""
+        offset = self.offset if offset is None else offset
+        key = self.memo_key(style, source_style, offset)
+        cleaned = self.get_memo('section', key)
+        if cleaned is None:
+            target = get_style(style)
+            if style is source_style and target.clean is not None:
+                cleaned = target.clean(self)
+            else:
+                description = get_style(source_style).describe(self, sanitize(self.lines))
+                cleaned = target.render(self, description, offset)
+            cleaned = self.set_memo(key, cleaned)
+        return cleaned
+
     @property
     def cleaned(self):
-        """Returns cleaned section."""
-        return apply_numpy_style(self)
+        """Returns cleaned section, the list is shared between accesses and must not be modified."""
+        return self.clean()
 
 
-@dataclass
-class Docstring:
-    """Docstring base structure."""
-    function: ast.FunctionDef
-    lines: list[str]
+class StyledRecord(Memoized):
+    """Records written in a docstring style, which is not a dataclass field."""
+    __slots__ = ('source_style',)
+
+
+@dataclass(slots=True)
+class Docstring(StyledRecord):
+    """Docstring base structure, lines is a view on the lines of the script.
+
+    The style in which it is written is detected once, its sections are parsed in that style and can be rendered in
+    any style."""
+    function: FunctionNode
+    lines: Sequence[str]
     start: int
     length: int
     offset: str = field(init=False)
     sections: list[DocstringSection] = field(init=False)
 
     @classmethod
-    def from_ast(cls, func: ast.FunctionDef, raw_text: list[str]):
-        """Parse ast tree structure."""
+    def from_ast(cls, func: FunctionNode, raw_text: Sequence[str]):
+        """Parse ast tree structure, the docstring lines are not copied from raw_text."""
         start, length = get_docstring_start_and_length(func, raw_text)
-        docstring_lines = raw_text[start:start + length]
-        return cls(func, docstring_lines, start, length)
+        return cls(func, LineView(raw_text, start, length), start, length)
 
     def __post_init__(self):
-        self.offset = re.search(r'(\s*)', self.lines[0]).group()
-        self.sections = parse_sections(self.function, self.lines)
+        self.offset = sys.intern(LEADING_WHITESPACE.search(self.lines[0]).group())
+        self.source_style = detect_style(self.lines)
+        # the script lines give access to the annotations source, used to cache their rendering
+        self.sections = parse_sections(self.function, self.lines, getattr(self.lines, 'source', None),
+                                       self.source_style)
+
+    def clean(self, style: DocstringStyle = DEFAULT_STYLE) -> list[str]:
+        """Cleaned docstring rendered in style from its sections.
+
+        It is computed once, and again only when the docstring, one of its sections or another record is modified."""
+        key = self.memo_key(style)
+        cleaned = self.get_memo('docstring', key)
+        if cleaned is None:
+            parts = [section.clean(style, self.source_style, self.offset) for section in self.sections]
+            types = [section.type for section in self.sections]
+            legacy = style is self.source_style and get_style(style).clean is not None
+            if not legacy and SectionType.ARG in types and SectionType.PARAMETER_DELIMITER not in types:
+                # docstrings without parameters header, such as reST ones, are given the one of the target style
+                delimiter = DocstringSection('', SectionType.PARAMETER_DELIMITER, offset=self.offset)
+                parts.insert(types.index(SectionType.ARG), get_style(style).render(delimiter, [], self.offset))
+            lines = [line for part in parts for line in part]
+            cleaned = self.set_memo(key, [self.offset + '"""', *lines, '', self.offset + '"""'])
+        return cleaned
 
     @property
     def cleaned(self):
-        """Apply cleaning functions."""
-        lines = [line for section in self.sections for line in section.cleaned]
-        return [self.offset + '"""', *lines, '', self.offset + '"""']
+        """Apply cleaning functions, the list is shared between accesses and must not be modified."""
+        return self.clean()
+
+
+def has_docstring(func: FunctionNode) -> bool:
+    """True if the body of the function starts with a docstring."""
+    first = func.body[0]
+    return (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+            and isinstance(first.value.value, str))
 
 
-def get_functions(raw_text: str):
-    """Finds the functions in the script file provided as o long str."""
-    # TODO walk the nodes ?
+@stage('parse')
+def get_functions(raw_text: str, with_docstring: bool = False) -> list[FunctionNode]:
+    """Finds the functions in the script file provided as o long str.
+
+    The statements of the whole tree are walked in source order, functions, async functions, methods and closures
+    are found at any depth. With with_docstring, functions without docstring are left out."""
     tree = ast.parse(raw_text)
 
-    functions = [item for item in tree.body if isinstance(item, ast.FunctionDef)]
-    classes = [item for item in tree.body if isinstance(item, ast.ClassDef)]
-    class_methods = [func for item in classes for func in item.body if isinstance(func, ast.FunctionDef)]
-    functions.extend(class_methods)
+    functions = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and (not with_docstring or has_docstring(node)):
+            functions.append(node)
+        children = [child for child in ast.iter_child_nodes(node) if isinstance(child, STATEMENT_NODES)]
+        stack.extend(reversed(children))
     return functions
 
 
-class ScriptFile:
+class ScriptFile(Memoized):
     """Base structure handling all functions found in a script file."""
 
-    def __init__(self, file_path: str):
-        """ScriptFile are usually initiated from python file."""
+    def __init__(self, file_path: str, raw_text: Optional[str] = None,
+                 line_ranges: Optional[list[LineRange]] = None, style: DocstringStyle = DEFAULT_STYLE):
+        """ScriptFile are usually initiated from python file, raw_text avoids reading it when already loaded.
+
+        With line_ranges (1-based, inclusive), only the docstrings of the functions whose signature or docstring
+        overlaps one of the ranges are cleaned, the rest of the script is left untouched. Docstrings are rendered in
+        style whatever the style they are written in, the script is parsed once for all styles. The cleaned script is
+        written with the line terminator of the script, which is read without translating it."""
 
         self.file_path = file_path
         file = Path(file_path)
         assert file_path.endswith('.py'), f'{file.name} is not a python script'
 
-        raw_text = file.read_text()
-        functions = get_functions(raw_text)
-        self.lines = raw_text.splitlines()
-        self.docstrings = [Docstring.from_ast(func, self.lines) for func in functions]
+        if raw_text is None:
+            with file.open(newline='') as f:
+                raw_text = f.read()
+        self.raw_text = raw_text
+        self.newline = detect_newline(raw_text)
+        functions = get_functions(raw_text, with_docstring=True)
+        if line_ranges is not None:
+            functions = [func for func in functions if overlaps(*get_header_span(func), line_ranges)]
+        self.functions = functions
+        self.lines = tuple(split_lines(raw_text))
+        self.style = style
+
+    def iter_docstrings(self) -> Iterator[Docstring]:
+        """Build the docstrings of the script one at a time, in source order."""
+        for func in self.functions:
+            yield Docstring.from_ast(func, self.lines)
+
+    @cached_property
+    def docstrings(self) -> list[Docstring]:
+        """All docstrings of the script, built on first access."""
+        return list(self.iter_docstrings())
+
+    def check(self) -> Optional[Docstring]:
+        """First docstring which is not clean, None if the whole script is clean.
+
+        Docstrings are built and compared to their cleaned version one at a time, the check stops at the first
+        difference and no cleaned script is built."""
+        for docstring in self.iter_docstrings():
+            if docstring.clean(self.style) != docstring.lines:
+                return docstring
 
     @property
-    def cleaned(self):
-        """Clean all docstring function found in script"""
-        cleaned = self.lines.copy()
-        offset = 0
-        for docstring in self.docstrings:
-            new_docstring = docstring.cleaned
-            new_length = len(new_docstring)
-            for _ in range(docstring.length):
-                cleaned.pop(docstring.start + offset)
-            for line in new_docstring[::-1]:
-                cleaned.insert(docstring.start + offset, line)
-            offset += new_length - docstring.length
-
+    def edits(self) -> Iterator[tuple[int, int, list[str]]]:
+        """Yield the (start, length, cleaned lines) of each docstring sorted by start."""
+        return self.iter_edits(self.style)
+
+    def iter_edits(self, style: DocstringStyle) -> Iterator[tuple[int, int, list[str]]]:
+        """Yield the (start, length, lines rendered in style) of each docstring sorted by start.
+
+        Docstrings are cleaned lazily, one at a time, as the edits are consumed."""
+        for docstring in sorted(self.docstrings, key=lambda item: item.start):
+            yield docstring.start, docstring.length, docstring.clean(style)
+
+    def iter_cleaned(self, style: Optional[DocstringStyle] = None) -> Iterator[list[str]]:
+        """Yield the cleaned script by chunks of lines, docstrings are rendered in style, the script one by default."""
+        return splice(self.lines, self.iter_edits(self.style if style is None else style))
+
+    def clean(self, style: Optional[DocstringStyle] = None) -> list[str]:
+        """Cleaned script whose docstrings are rendered in style, the script one by default.
+
+        The result is computed once, and again only when the script, one of its docstrings or another record is
+        modified. The list is shared between accesses and must not be modified."""
+        style = self.style if style is None else style
+        key = self.memo_key(style)
+        cleaned = self.get_memo('script', key)
+        if cleaned is None:
+            cleaned = self.set_memo(key, [line for chunk in self.iter_cleaned(style) for line in chunk])
         return cleaned
 
-    def write_clean(self):
-        """Write in edit file"""
-        new_text = '\n'.join(self.cleaned)
-        new_file_path = Path(re.sub(r'\.py$', '_edit.py', self.file_path))
-        new_file_path.write_text(new_text)
-
-
-def get_docstring_start_and_length(func: ast.FunctionDef, raw_text: list[str]) -> tuple[int, int]:
-    """Get the start and the length of the docstring associated with function."""
-    docstring = ast.get_docstring(func)
-    tag_search = re.compile(DOCSTRING_TAGS['generic'])  # match """
+    @property
+    def cleaned(self):
+        """Clean all docstring function found in script, the list is shared between accesses and must not be
+        modified."""
+        return self.clean()
 
-    def get_tag_from(index, offset=0):
-        """Adjust the index by searching triple quote tag."""
-        match = re.search(tag_search, raw_text[index + offset])
-        while not match:
-            index += 1
-            match = re.search(tag_search, raw_text[index + offset])
+    @property
+    def cleaned_text(self) -> str:
+        """Cleaned script as a single str, the line terminator and the trailing new line of the file are kept."""
+        text = self.newline.join(self.cleaned)
+        if self.raw_text.endswith(('\n', '\r')):
+            text += self.newline
+        return text
 
-        return index
+    @property
+    def changed(self) -> bool:
+        """True if one of the docstrings is not clean."""
+        return any(docstring.clean(self.style) != docstring.lines for docstring in self.docstrings)
+
+    def write(self, file: TextIO):
+        """Write the cleaned script in file, chunk by chunk, file must not translate new lines."""
+        write_lines(file, self.iter_cleaned(), self.newline)
+        if self.raw_text.endswith(('\n', '\r')):
+            file.write(self.newline)
+
+    def write_clean(self, in_place: bool = False) -> bool:
+        """Write in edit file, the cleaned script is streamed chunk by chunk.
+
+        With in_place, the script itself is replaced atomically by the cleaned one, unless it is already clean in
+        which case it is not written at all and its modification time is kept. Returns whether a file was written."""
+        if not in_place:
+            with edit_path(self.file_path).open('w', newline='') as file:
+                self.write(file)
+            return True
+        return self.changed and replace_file(self.file_path, self.write)
+
+
+def splice(lines: list[str], edits: Iterable[tuple[int, int, list[str]]]) -> Iterator[list[str]]:
+    """Yield lines by chunks, each edit (start, length, replacement) replacing lines[start:start + length].
+
+    Edits must be sorted by start and must not overlap, they are applied in a single forward pass."""
+    position = 0
+    for start, length, replacement in edits:
+        yield lines[position:start]
+        yield replacement
+        position = start + length
+    yield lines[position:]
+
+
+def write_lines(file: TextIO, chunks: Iterable[list[str]], newline: str = '\n'):
+    """Write chunks of lines separated by newline, as newline.join would do on the concatenated chunks."""
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if not first:
+            file.write(newline)
+        file.write(newline.join(chunk))
+        first = False
+
+
+def edit_path(file_path: str) -> Path:
+    """Path of the edit file in which the cleaned script is written."""
+    return Path(re.sub(r'\.py$', '_edit.py', file_path))
+
+
+def replace_file(file_path: str, write: Callable[[IO], Optional[bool]], mode: str = 'w') -> bool:
+    """Write a temporary file next to file_path with write, then replace file_path by it in a single rename.
+
+    Readers never see a partially written file and the permissions of file_path are kept. file_path is left untouched
+    when write raises or returns False. Returns whether file_path was replaced. A symbolic link is followed, the file
+    it points to is replaced and the link is kept. New lines are not translated in text mode."""
+    path = Path(file_path).resolve()
+    newline = None if 'b' in mode else ''
+    file = tempfile.NamedTemporaryFile(mode, newline=newline, dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp',
+                                       delete=False)
+    try:
+        with file:
+            replaced = write(file) is not False
+        if replaced:
+            shutil.copymode(path, file.name)
+            os.replace(file.name, path)
+        return replaced
+    finally:
+        Path(file.name).unlink(missing_ok=True)  # the temporary file is left over unless it replaced file_path
+
+
+def get_header_span(func: FunctionNode) -> tuple[int, int]:
+    """First and last lines (1-based) of the decorators, signature and docstring of the function.
+
+    Those are the only lines the cleaned docstring depends on."""
+    first = min([func.lineno, *(decorator.lineno for decorator in func.decorator_list)])
+    last = func.body[0].end_lineno
+    return first, last
+
+
+def get_docstring_start_and_length(func: FunctionNode, raw_text: list[str]) -> tuple[int, int]:
+    """Get the start and the length of the docstring associated with function.
+
+    The position of the docstring node is used, from the line of the opening triple quote to the line of the closing
+    one, raw_text is not scanned."""
+    if not has_docstring(func):
+        raise ValueError(f'{func.name} has no docstring')
+    node = func.body[0].value
+    return node.lineno - 1, node.end_lineno - node.lineno + 1
+
+
+def scan_tokens(tokens: Iterable[str], raw_text: list[str]) -> dict[str, tuple[int, str]]:
+    """Find the first line starting with each token in a single pass over the docstring.
+
+    Leading whitespaces are ignored, the returned mapping gives the index and the indentation of the line found for
+    each token, indentations are interned as they repeat across the whole script. Tokens are compared by prefix so
+    that a line is matched against all of them at once through a set lookup per distinct token length."""
+    tokens = set(tokens)
+    lengths = sorted({len(token) for token in tokens})
+    found = {}
+    for n, line in enumerate(raw_text):
+        content = line.lstrip()
+        for length in lengths:
+            if length > len(content):
+                break
+            token = content[:length]
+            if token in tokens and token not in found:
+                found[token] = (n, sys.intern(line[:len(line) - len(content)]))
+        if len(found) == len(tokens):
+            break
+    return found
 
-    # detect start
-    start = func.lineno - 1
-    start = get_tag_from(start)
 
-    # detect end
-    length = len(docstring.splitlines())
-    length = get_tag_from(length, offset=start - 1)
-    return start, length
+def detect_section(token_name: str, found: dict[str, tuple[int, str]],
+                   section_type: SectionType, name: Optional[str] = None) -> Optional[DocstringSection]:
+    """Generic method to build a DocstringSection from the tokens found in the docstring, named token_name by
+    default."""
+    if token_name in found:
+        start, offset = found[token_name]
+        return DocstringSection(name=token_name if name is None else name, start=start, offset=offset,
+                                type=section_type)
 
 
-def detect_section(token_name: str, raw_text: list[str], section_type: SectionType) -> Optional[DocstringSection]:
-    """Generic method to detect a DocstringSection in the docstring."""
-    pattern = re.compile(rf'^(\s*)({token_name})')
-    for n, line in enumerate(raw_text):
-        match = re.search(pattern, line)
-        if match:
-            offset, _ = match.groups()
-            section = DocstringSection(name=token_name,
-                                       start=n,
-                                       offset=offset,
-                                       type=section_type)
-            return section
+def first_token(tokens: Iterable[str], found: dict[str, tuple[int, str]]) -> Optional[str]:
+    """Token found first in the docstring among tokens, None if none was found."""
+    return min((token for token in tokens if token in found), key=lambda token: found[token][0], default=None)
 
 
 def detect_summary_section(raw_text: list[str]) -> DocstringSection:
     """Detect the Summary section."""
-    match = re.search(rf'^(\s*)', raw_text[0])  # match whitespace
-    offset = match.group() if match else None
+    match = LEADING_WHITESPACE.match(raw_text[0])  # match whitespace
+    offset = sys.intern(match.group()) if match else None
     return DocstringSection(name='Summary', type=SectionType.SUMMARY, start=0, offset=offset)
 
 
-def detect_param_delimiter_section(raw_text: list[str]):
+def detect_other_sections(raw_text: Sequence[str], header: re.Pattern) -> list[DocstringSection]:
+    """Detect the sections kept as written, whose header is at the indentation of the docstring."""
+    offset = LEADING_WHITESPACE.match(raw_text[0]).group()
+    sections = []
+    for n, line in enumerate(raw_text[1:], 1):
+        match = header.match(line)
+        if match and match.group(1) == offset:
+            sections.append(DocstringSection(name=match.group(2), type=SectionType.OTHER, start=n,
+                                             offset=sys.intern(offset)))
+    return sections
+
+
+def detect_param_delimiter_section(found: dict[str, tuple[int, str]], style: Style = get_style(DEFAULT_STYLE)):
     """Detect the parameters section."""
-    delimiter = DELIMITERS[DocstringStyle.NUMPY]['param']
-    return detect_section(delimiter, raw_text, SectionType.PARAMETER_DELIMITER)
+    delimiter = first_token(style.param_tokens, found)
+    if delimiter is not None:
+        return detect_section(delimiter, found, SectionType.PARAMETER_DELIMITER)
 
 
-def detect_return_section(function: ast.FunctionDef, raw_text: list[str]) -> Optional[DocstringSection]:
-    """Detect the returns section."""
-    delimiter = DELIMITERS[DocstringStyle.NUMPY]['returns']
-    section = detect_section(delimiter, raw_text, SectionType.RETURNS)
+def detect_return_section(function: FunctionNode, found: dict[str, tuple[int, str]],
+                          source: Optional[Sequence[str]] = None,
+                          style: Style = get_style(DEFAULT_STYLE)) -> Optional[DocstringSection]:
+    """Detect the returns section, source holds the lines of the script."""
+    delimiter = first_token(style.returns_tokens, found)
+    section = None if delimiter is None else detect_section(delimiter, found, SectionType.RETURNS)
     if section is not None:
-        section.annotation = parse_returns(function)
+        section.annotation = parse_returns(function, source)
         return section
 
 
-def detect_argument_section(item: ast.arg, raw_text: list[str]) -> Optional[DocstringSection]:
-    """"Detect the argument section."""
-    token_name = item.arg
-    section = detect_section(token_name, raw_text, SectionType.ARG)
+def detect_argument_section(item: ast.arg, found: dict[str, tuple[int, str]],
+                            source: Optional[Sequence[str]] = None,
+                            style: Style = get_style(DEFAULT_STYLE)) -> Optional[DocstringSection]:
+    """"Detect the argument section, source holds the lines of the script."""
+    section = detect_section(style.argument_token(item.arg), found, SectionType.ARG, item.arg)
     if section is not None:
-        section.annotation = parse_annotation(item)
+        section.annotation = parse_annotation(item, source)
         return section
 
 
-def parse_sections(function: ast.FunctionDef, raw_text: list[str]) -> list[DocstringSection]:
-    """Split the docstring into multiple sections."""
-    # TODO Auto detect docstring style
+@stage('sections')
+def parse_sections(function: FunctionNode, raw_text: Sequence[str], source: Optional[Sequence[str]] = None,
+                   style: Optional[DocstringStyle] = None) -> list[DocstringSection]:
+    """Split the docstring into multiple sections, the lines of each section are a view on raw_text.
+
+    With source, the lines of the whole script, annotations are rendered through a cache keyed by their source. The
+    sections are delimited with the tokens of style, which is detected from the docstring when not given."""
+    style = get_style(detect_style(raw_text) if style is None else style)
+    tokens = [*(style.argument_token(item.arg) for item in function.args.args), *style.param_tokens,
+              *style.returns_tokens]
+    found = scan_tokens(tokens, raw_text)
+
     sections = [detect_summary_section(raw_text)]
     for item in function.args.args:
-        section = detect_argument_section(item, raw_text)
+        section = detect_argument_section(item, found, source, style)
         if section is not None:
             sections.append(section)
 
-    section = detect_param_delimiter_section(raw_text)
+    section = detect_param_delimiter_section(found, style)
     if section is not None:
         sections.append(section)
 
-    section = detect_return_section(function, raw_text)
+    section = detect_return_section(function, found, source, style)
     if section is not None:
         sections.append(section)
 
+    if style.other_header is not None:
+        sections.extend(detect_other_sections(raw_text, style.other_header))
+
     # sort and define the length of each section
     sections.sort(key=lambda x: x.start)
     for n, item in enumerate(sections):
@@ -198,6 +512,6 @@ def parse_sections(function: ast.FunctionDef, raw_text: list[str]) -> list[Docst
             item.length = sections[n + 1].start - item.start
         else:
             item.length = len(raw_text) - item.start
-        item.lines = raw_text[item.start:item.start + item.length]
+        item.lines = LineView(raw_text, item.start, item.length)
 
     return sections
@@ -0,0 +1,63 @@
+"""Implements an on disk cache of cleaned script files."""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from . import __version__
+from .utils import DEFAULT_CACHE_DIR, DocstringStyle
+
+DEFAULT_CACHE_SIZE = 64 * 2 ** 20  # in bytes
+
+
+class CleanCache:
+    """Cache of cleaned scripts keyed by the hash of their content, the tool version and the docstring style.
+
+    Each entry is a json file holding null when the script is already clean, the cleaned text otherwise. Hits
+    refresh the modification time of the entry so that prune evicts the least recently used entries first."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_CACHE_SIZE,
+                 style: DocstringStyle = DocstringStyle.NUMPY):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.style = style
+
+    def key(self, raw_text: str) -> str:
+        """Hash identifying the cleaned output of raw_text."""
+        content = '\0'.join((__version__, self.style.name, raw_text))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, raw_text: str) -> Optional[str]:
+        """Cleaned text of raw_text, None if it is not cached yet."""
+        entry = self.directory / self.key(raw_text)
+        try:
+            cleaned = json.loads(entry.read_text())
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        return raw_text if cleaned is None else cleaned
+
+    def set(self, raw_text: str, cleaned: str):
+        """Store the cleaned text of raw_text."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        content = json.dumps(None if cleaned == raw_text else cleaned)
+
+        # write in a temporary file first, entries may be written concurrently by several processes
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, suffix='.tmp', delete=False) as file:
+            file.write(content)
+        os.replace(file.name, self.directory / self.key(raw_text))
+
+    def prune(self):
+        """Evict the least recently used entries until the cache fits in max_size."""
+        try:
+            entries = [(entry.stat(), entry) for entry in self.directory.iterdir() if entry.suffix != '.tmp']
+        except OSError:
+            return
+        size = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+            if size <= self.max_size:
+                break
+            entry.unlink(missing_ok=True)
+            size -= stat.st_size
@@ -0,0 +1,193 @@
+"""Implements a formatter daemon answering format and check requests over a unix socket.
+
+Editors calling the formatter on each save pay the interpreter startup and a full parse every time. The daemon keeps
+the cleaned scripts in memory, keyed by path and modification time, so that requests on unchanged files are answered
+without parsing them again. Start it with `python -m docstring_format.daemon serve`, then send requests with
+`python -m docstring_format.daemon format|check PATH...`. The client side only relies on the standard library."""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .utils import DocstringStyle
+
+DEFAULT_SOCKET = os.path.join(os.environ.get('TMPDIR', '/tmp'), f'docstring_format-{os.getuid()}.sock')
+DEFAULT_MEMORY_BUDGET = 64 * 2 ** 20  # in bytes
+
+
+class ScriptCache:
+    """In memory LRU cache of cleaned scripts, entries are valid as long as the file mtime and size are unchanged.
+
+    The memory used by the cached texts is kept under memory_budget by evicting the least recently used entries.
+    Docstrings are rendered in style."""
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, style: DocstringStyle = DocstringStyle.NUMPY):
+        self.memory_budget = memory_budget
+        self.style = style
+        self.entries: OrderedDict[str, tuple[tuple[int, int], str, str]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def entry_size(raw_text: str, cleaned: str) -> int:
+        """Memory used by an entry, texts of clean scripts are shared."""
+        return sys.getsizeof(raw_text) + (0 if cleaned is raw_text else sys.getsizeof(cleaned))
+
+    def get(self, file_path: str) -> tuple[str, str]:
+        """Source and cleaned text of the script, parsed only if the file changed since it was cached."""
+        from .base import ScriptFile
+
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            entry = self.entries.get(file_path)
+            if entry is not None and entry[0] == stamp:
+                self.hits += 1
+                self.entries.move_to_end(file_path)
+                return entry[1], entry[2]
+            self.misses += 1
+
+        with open(file_path) as file:
+            raw_text = file.read()
+        cleaned = ScriptFile(file_path, raw_text, style=self.style).cleaned_text
+        if cleaned == raw_text:
+            cleaned = raw_text
+        self.set(file_path, stamp, raw_text, cleaned)
+        return raw_text, cleaned
+
+    def set(self, file_path: str, stamp: tuple[int, int], raw_text: str, cleaned: str):
+        """Store an entry and evict the least recently used ones beyond the memory budget."""
+        with self.lock:
+            previous = self.entries.pop(file_path, None)
+            if previous is not None:
+                self.size -= self.entry_size(previous[1], previous[2])
+            self.entries[file_path] = (stamp, raw_text, cleaned)
+            self.size += self.entry_size(raw_text, cleaned)
+            while self.size > self.memory_budget and self.entries:
+                _, (_, evicted_raw, evicted_cleaned) = self.entries.popitem(last=False)
+                self.size -= self.entry_size(evicted_raw, evicted_cleaned)
+
+    def stats(self) -> dict:
+        """Hits, misses and memory used by the cache."""
+        return {'entries': len(self.entries), 'size': self.size, 'memory_budget': self.memory_budget,
+                'hits': self.hits, 'misses': self.misses}
+
+
+def format_request(cache: ScriptCache, file_path: str) -> dict:
+    """Write the cleaned script in its edit file."""
+    from .base import edit_path
+
+    _, cleaned = cache.get(file_path)
+    edit_path(file_path).write_text(cleaned)
+    return {'file': file_path}
+
+
+def check_request(cache: ScriptCache, file_path: str) -> dict:
+    """Report the first function whose docstring is not clean in the style of the cache, if any."""
+    from .base import ScriptFile
+
+    raw_text, cleaned = cache.get(file_path)
+    if cleaned is raw_text:
+        return {'file': file_path, 'function': None, 'lineno': None}
+    docstring = ScriptFile(file_path, raw_text, style=cache.style).check()
+    return {'file': file_path, 'function': docstring.function.name, 'lineno': docstring.function.lineno}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Answer a single json request per connection, with a single json response."""
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        command = request.get('command')
+        try:
+            if command == 'format':
+                response = format_request(self.server.cache, request['path'])
+            elif command == 'check':
+                response = check_request(self.server.cache, request['path'])
+            elif command == 'stats':
+                response = self.server.cache.stats()
+            elif command == 'stop':
+                threading.Thread(target=self.server.shutdown).start()
+                response = {}
+            else:
+                raise ValueError(f'unknown command {command}')
+        except Exception as error:
+            response = {'file': request.get('path'), 'error': f'{type(error).__name__}: {error}'}
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class FormatterServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server holding the cache of cleaned scripts, whose docstrings are rendered in style."""
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 style: DocstringStyle = DocstringStyle.NUMPY):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, RequestHandler)
+        self.cache = ScriptCache(memory_budget, style)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def serve(socket_path: str = DEFAULT_SOCKET, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+          style: DocstringStyle = DocstringStyle.NUMPY):
+    """Run the daemon until it receives a stop request, docstrings are rendered in style."""
+    with FormatterServer(socket_path, memory_budget, style) as server:
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+def request(command: str, path: Optional[str] = None, socket_path: str = DEFAULT_SOCKET) -> dict:
+    """Send a request to the daemon and return its response."""
+    message = {'command': command}
+    if path is not None:
+        message['path'] = os.path.abspath(path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(message).encode() + b'\n')
+        with client.makefile('rb') as response:
+            return json.loads(response.readline())
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line of the daemon and its client, argparse is used to keep the client startup light."""
+    parser = argparse.ArgumentParser(prog='python -m docstring_format.daemon')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help='start the daemon')
+    serve_parser.add_argument('--memory-budget', type=int, default=DEFAULT_MEMORY_BUDGET // 2 ** 20, help='in Mb')
+    serve_parser.add_argument('--style', default='numpy', choices=[style.name.lower() for style in DocstringStyle])
+    for command in ('format', 'check'):
+        subparsers.add_parser(command, help=f'{command} scripts').add_argument('paths', nargs='+')
+    subparsers.add_parser('stats', help='print the cache statistics')
+    subparsers.add_parser('stop', help='stop the daemon')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.socket, args.memory_budget * 2 ** 20, DocstringStyle[args.style.upper()])
+        return 0
+    if args.command in ('stats', 'stop'):
+        print(json.dumps(request(args.command, socket_path=args.socket)))
+        return 0
+
+    responses = [request(args.command, path, args.socket) for path in args.paths]
+    print(json.dumps(responses, indent=4))
+    failed = any(response.get('error') or response.get('function') for response in responses)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
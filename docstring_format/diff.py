@@ -0,0 +1,52 @@
+"""Implements the detection of the lines changed in script files."""
+import re
+import subprocess
+from pathlib import Path
+from typing import Iterable
+
+from .utils import LineRange
+
+FILE_HEADER = re.compile(r'^\+\+\+ (?:b/)?(.*)$')  # match `+++ b/path/to/file.py`
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')  # match `@@ -12,3 +12,4 @@`
+
+
+def parse_diff(diff_text: str) -> dict[str, list[LineRange]]:
+    """Line ranges of the new version of each file found in a unified diff, as produced by `git diff -U0`.
+
+    Pure deletions are reported as the line preceding them, so that the enclosing function is still caught."""
+    ranges = {}
+    current = None
+    for line in diff_text.splitlines():
+        match = FILE_HEADER.match(line)
+        if match:
+            name = match.group(1)
+            current = None if name == '/dev/null' else ranges.setdefault(name, [])
+            continue
+
+        match = HUNK_HEADER.match(line)
+        if match and current is not None:
+            start = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+            current.append((start, start + max(count, 1) - 1))
+    return ranges
+
+
+def git_diff_ranges(ref: str = 'HEAD', paths: Iterable[str] = ()) -> dict[str, list[LineRange]]:
+    """Line ranges changed in the working tree relative to ref, keyed by absolute file path."""
+    def git(*args) -> str:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout
+
+    root = Path(git('rev-parse', '--show-toplevel').strip())
+    diff_text = git('diff', '-U0', '--no-color', '--no-ext-diff', '--src-prefix=a/', '--dst-prefix=b/', ref,
+                    '--', *paths)
+    return {str(root / name): ranges for name, ranges in parse_diff(diff_text).items()}
+
+
+def parse_line_ranges(text: str) -> list[LineRange]:
+    """Parse an explicit list of line ranges such as `10-20,35`."""
+    ranges = []
+    for item in text.split(','):
+        first, _, last = item.strip().partition('-')
+        ranges.append((int(first), int(last or first)))
+    return ranges
+
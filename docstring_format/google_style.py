@@ -0,0 +1,59 @@
+"""Apply formatting of google style to docstring"""
+import re
+from typing import TYPE_CHECKING
+
+from .numpy_style import collapse_blank_lines, indent_lines, keep_section
+from .profiling import stage
+from .utils import DELIMITERS, INDENT, DocstringStyle, SectionType, compile_pattern
+
+if TYPE_CHECKING:
+    from .base import DocstringSection
+
+# headers of the sections parsed in google style, the others such as `Raises:` are kept as written in any style
+SECTION_HEADER = re.compile(r'^\s*(Args|Arguments|Parameters|Returns):\s*$')
+
+
+def detect_google_style(lines: list[str]) -> bool:
+    """True if a line of the docstring is a google section header such as `Args:`."""
+    return any(SECTION_HEADER.match(line) for line in lines[1:])
+
+
+def describe_google_section(section: 'DocstringSection', lines: list[str]) -> list[str]:
+    """Description of a section written in google style, without its header, argument name and type."""
+    if section.type == SectionType.SUMMARY:
+        return lines
+    if section.type in (SectionType.PARAMETER_DELIMITER, SectionType.OTHER):
+        return []
+    if section.type == SectionType.RETURNS:
+        if lines and lines[0] in DELIMITERS[DocstringStyle.GOOGLE]['returns']:
+            lines = lines[1:]
+        if lines and section.annotation and lines[0].startswith(section.annotation + ':'):
+            lines = [lines[0].removeprefix(section.annotation + ':').strip(), *lines[1:]]
+        return lines if lines and lines[0] else lines[1:]
+
+    # `name (type): description`
+    match = compile_pattern(rf'^{re.escape(section.name)}\s*(?:\([^)]*\))?\s*:?\s*(.*)$').match(lines[0])
+    first = match.group(1) if match else lines[0]
+    return [first, *lines[1:]] if first else lines[1:]
+
+
+@stage('cleaning')
+def render_google_section(section: 'DocstringSection', description: list[str], offset: str) -> list[str]:
+    """Render a section in google style from its description, offset is the indentation of the docstring."""
+    if section.type == SectionType.SUMMARY:
+        return indent_lines(collapse_blank_lines(description), offset)
+    if section.type == SectionType.PARAMETER_DELIMITER:
+        return ['', offset + 'Args:']
+    if section.type == SectionType.OTHER:
+        return keep_section(section)
+
+    first, *rest = description or ['']
+    if section.type == SectionType.ARG:
+        header = f'{section.name} ({section.annotation})' if section.annotation else section.name
+        lines = [f'{header}: {first}'.rstrip()]
+    elif section.annotation:
+        lines = [f'{section.annotation}: {first}'.rstrip()]
+    else:
+        lines = [first] if first else []
+    body = [*indent_lines(lines, offset + INDENT), *indent_lines(rest, offset + INDENT * 2)]
+    return ['', offset + 'Returns:', *body] if section.type == SectionType.RETURNS else body
@@ -2,18 +2,24 @@
 import re
 from typing import TYPE_CHECKING
 
-from .utils import DOCSTRING_TAGS, SectionType, is_empty_line
+from .profiling import stage
+from .utils import DOCSTRING_TAGS_REGEX, INDENT, SectionType, compile_pattern, is_empty_line
 
 if TYPE_CHECKING:
     from .base import DocstringSection
 
+CONSECUTIVE_BLANK_LINES = re.compile(r'\n{3,}')
+RETURNS_LINE = re.compile('[Rr]eturns?')
+DASH_LINE = re.compile('-+')
+UNDERLINE = re.compile(r'^\s*-{3,}\s*$')
+
 
 def sanitize(lines: list[str]):
     """Remove docstring tags and empty lines at the beggining and the end of the docstring."""
 
     def remove_tags(line, tag):
         """Remove docstring tags from the lines."""
-        match = re.search(tag, line)
+        match = tag.search(line)
         if match:
             return ''.join(match.groups())
         return line
@@ -28,8 +34,8 @@ def sanitize(lines: list[str]):
 
     # remove docstring tag at the first and last line
     lines = [line.strip() for line in lines]
-    lines[0] = remove_tags(lines[0], DOCSTRING_TAGS['first'])
-    lines[-1] = remove_tags(lines[-1], DOCSTRING_TAGS['last'])
+    lines[0] = remove_tags(lines[0], DOCSTRING_TAGS_REGEX['first'])
+    lines[-1] = remove_tags(lines[-1], DOCSTRING_TAGS_REGEX['last'])
 
     # remove trailing empty lines
     pop_empty_lines(lines, 0)
@@ -37,6 +43,7 @@ def sanitize(lines: list[str]):
     return lines
 
 
+@stage('cleaning')
 def apply_numpy_style(section: 'DocstringSection') -> list[str]:
     """Main entry point to annotate function.
 
@@ -51,8 +58,8 @@ def clean_summary_section(section: 'DocstringSection', lines: list[str]):
     """Adjust the summary section."""
     # remove consecutive blank lines
     text = '\n'.join(lines)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    lines = [section.offset + line for line in text.splitlines()]
+    text = CONSECUTIVE_BLANK_LINES.sub('\n\n', text)
+    lines = indent_lines(text.splitlines(), section.offset)
     return lines
 
 
@@ -74,24 +81,24 @@ def clean_argument_section(section: 'DocstringSection', lines: list[str]):
         line = lines.pop(0)
         # check for description on the same line that the parameter name
         description = None
-        pattern = re.compile(rf'{section.name}.*{section.annotation}[():\s_]*(.*)')
-        match = re.search(pattern, line)
+        pattern = compile_pattern(rf'{section.name}.*{section.annotation}[():\s_]*(.*)')
+        match = pattern.search(line)
         if match:
             description = match.groups()[0]
         else:
-            pattern = re.compile(rf'{section.name}[():\s_]*(.*)')
-            match = re.search(pattern, line)
+            pattern = compile_pattern(rf'{section.name}[():\s_]*(.*)')
+            match = pattern.search(line)
             if match:
                 description = match.groups()[0]
 
         # correct indentation
-        lines = [offset * 2 + line for line in lines]
+        lines = indent_lines(lines, offset * 2)
         if description:
             lines = [annotated_argument, offset * 2 + description.capitalize(), *lines]
         else:
             lines = [annotated_argument, *lines]
     else:
-        lines = [offset * min(2, n + 1) + line for n, line in enumerate(lines)]
+        lines = [offset * min(2, n + 1) + line if line else '' for n, line in enumerate(lines)]
 
     return lines
 
@@ -103,17 +110,21 @@ def clean_return_section(section: 'DocstringSection', lines: list[str]):
     # remove first line delimiters
     for _ in range(len(lines)):
         line = lines[0]
-        if (re.search('[Rr]eturns?', line) or
-                re.search('-+', line) or
+        if (RETURNS_LINE.search(line) or
+                DASH_LINE.search(line) or
                 is_empty_line(line)):
             lines.pop(0)
 
-    # remove whitespaces and add twice the offset
-    lines = [offset * 2 + line.strip() for line in lines]
+    # remove whitespaces and add twice the offset, the type line is kept at the offset
+    lines = [line.strip() for line in lines]
+    type_line = []
     if section.annotation:
-        pattern = re.compile(f'{section.annotation}')
-        if not any([re.search(pattern, line) for line in lines]):
-            lines.insert(0, offset + section.annotation)
+        pattern = compile_pattern(f'{section.annotation}')
+        if lines and lines[0] == section.annotation:
+            type_line = [offset + lines.pop(0)]
+        elif not any([pattern.search(line) for line in lines]):
+            type_line = [offset + section.annotation]
+    lines = [*type_line, *(offset * 2 + line for line in lines)]
 
     # add return delimiter
     lines = ['',
@@ -127,4 +138,69 @@ def clean_return_section(section: 'DocstringSection', lines: list[str]):
 NUMPY_ANNOTATE_MAP = {SectionType.SUMMARY: clean_summary_section,
                       SectionType.PARAMETER_DELIMITER: clean_parameter_section,
                       SectionType.ARG: clean_argument_section,
-                      SectionType.RETURNS: clean_return_section}
+                      SectionType.RETURNS: clean_return_section,
+                      SectionType.OTHER: lambda section, lines: keep_section(section)}
+
+
+def detect_numpy_style(lines: list[str]) -> bool:
+    """True if a section header of the docstring is underlined with dashes."""
+    return any(UNDERLINE.match(line) for line in lines[1:])
+
+
+def indent_lines(lines: list[str], prefix: str) -> list[str]:
+    """Lines preceded by prefix, blank lines are left empty instead of holding trailing whitespaces."""
+    return [prefix + line if line else '' for line in lines]
+
+
+def keep_section(section: 'DocstringSection') -> list[str]:
+    """Lines of a section kept as written, preceded by a blank line.
+
+    The closing quotes of the docstring, trailing whitespaces and trailing blank lines are removed."""
+    lines = [line.rstrip() for line in section.lines]
+    match = DOCSTRING_TAGS_REGEX['last'].search(lines[-1])
+    if match:
+        lines[-1] = ''.join(match.groups()).rstrip()
+    while lines and not lines[-1]:
+        lines.pop()
+    return ['', *lines]
+
+
+def collapse_blank_lines(lines: list[str]) -> list[str]:
+    """Lines where consecutive blank lines are replaced by a single one."""
+    return CONSECUTIVE_BLANK_LINES.sub('\n\n', '\n'.join(lines)).splitlines()
+
+
+def describe_numpy_section(section: 'DocstringSection', lines: list[str]) -> list[str]:
+    """Description of a section written in numpy style, without its header, argument name and type."""
+    if section.type == SectionType.SUMMARY:
+        return lines
+    if section.type in (SectionType.PARAMETER_DELIMITER, SectionType.OTHER):
+        return []
+    if section.type == SectionType.RETURNS:
+        while lines and (RETURNS_LINE.match(lines[0]) or DASH_LINE.match(lines[0]) or is_empty_line(lines[0])):
+            lines = lines[1:]
+        if lines and section.annotation and lines[0] == section.annotation:
+            lines = lines[1:]
+        return lines
+
+    # `name : type` followed by the description, or `name: description`
+    first = lines[0].removeprefix(section.name).lstrip(' :')
+    if section.annotation and first.startswith(section.annotation):
+        first = first.removeprefix(section.annotation).lstrip(' ,:')
+    return [first, *lines[1:]] if first else lines[1:]
+
+
+@stage('cleaning')
+def render_numpy_section(section: 'DocstringSection', description: list[str], offset: str) -> list[str]:
+    """Render a section in numpy style from its description, offset is the indentation of the docstring."""
+    if section.type == SectionType.SUMMARY:
+        return indent_lines(collapse_blank_lines(description), offset)
+    if section.type == SectionType.PARAMETER_DELIMITER:
+        return ['', offset + 'Parameters', offset + '----------']
+    if section.type == SectionType.OTHER:
+        return keep_section(section)
+    if section.type == SectionType.ARG:
+        header = f'{section.name} : {section.annotation}' if section.annotation else section.name
+        return [offset + header, *indent_lines(description, offset + INDENT)]
+    annotation = [offset + section.annotation] if section.annotation else []
+    return ['', offset + 'Returns', offset + '-------', *annotation, *indent_lines(description, offset + INDENT)]
@@ -0,0 +1,98 @@
+"""Implements optional timers of the stages of the cleaning pipeline.
+
+Stages are functions decorated with stage, files are processed by functions decorated with per_file. Both decorators
+return the function itself unless profiling is enabled through the DOCSTRING_FORMAT_PROFILE environment variable when
+the module defining it is imported, so that profiling costs nothing when disabled. The command line sets the variable
+before importing the pipeline, worker processes inherit it."""
+import os
+import time
+from functools import wraps
+from typing import Callable, Iterable
+
+ENV_VARIABLE = 'DOCSTRING_FORMAT_PROFILE'
+ENABLED = bool(os.environ.get(ENV_VARIABLE))
+
+# stage name -> [calls, seconds] accumulated in this process since the last collect
+timings: dict[str, list] = {}
+
+
+def enable():
+    """Enable profiling for the modules imported from now on and for the worker processes started from now on."""
+    global ENABLED
+    os.environ[ENV_VARIABLE] = '1'
+    ENABLED = True
+
+
+def stage(name: str) -> Callable:
+    """Decorator accumulating the calls and the time spent in a function under the stage name."""
+    def decorator(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                entry = timings.setdefault(name, [0, 0.0])
+                entry[0] += 1
+                entry[1] += time.perf_counter() - start
+        return timed
+    return decorator
+
+
+def collect() -> dict[str, dict]:
+    """Calls and seconds per stage since the last collect, timers are reset."""
+    collected = {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in timings.items()}
+    timings.clear()
+    return collected
+
+
+def per_file(func: Callable) -> Callable:
+    """Decorator of the functions processing a file and returning a report, which is given a profile attribute.
+
+    The profile holds the total seconds spent on the file and the time spent in each stage, it is returned along with
+    the report so that profiles of files processed in worker processes are sent back to the parent process."""
+    if not ENABLED:
+        return func
+
+    @wraps(func)
+    def profiled(*args, **kwargs):
+        collect()
+        start = time.perf_counter()
+        report = func(*args, **kwargs)
+        report.profile = {'seconds': time.perf_counter() - start, 'stages': collect()}
+        return report
+    return profiled
+
+
+def summarize(reports: Iterable) -> dict:
+    """Profile of a run from the reports of its files: cumulative stages and files sorted from the slowest."""
+    stages = {}
+    files = []
+    for report in reports:
+        if report.profile is None:
+            continue
+        files.append({'file': report.file_path, **report.profile})
+        for name, entry in report.profile['stages'].items():
+            total = stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+            total['calls'] += entry['calls']
+            total['seconds'] += entry['seconds']
+    files.sort(key=lambda item: item['seconds'], reverse=True)
+    return {'seconds': sum(item['seconds'] for item in files), 'stages': stages, 'files': files}
+
+
+def format_summary(summary: dict, top: int = 10) -> str:
+    """Table of the cumulative time per stage and of the top slowest files."""
+    lines = [f'{"stage":<12} {"calls":>8} {"seconds":>10}']
+    for name, entry in sorted(summary['stages'].items(), key=lambda item: item[1]['seconds'], reverse=True):
+        lines.append(f'{name:<12} {entry["calls"]:>8} {entry["seconds"]:>10.3f}')
+    lines.append(f'{"total":<12} {len(summary["files"]):>8} {summary["seconds"]:>10.3f}')
+
+    names = sorted({name for item in summary['files'][:top] for name in item['stages']})
+    lines.extend(['', ' '.join([f'{"seconds":>10}', *(f'{name:>10}' for name in names), 'file'])])
+    for item in summary['files'][:top]:
+        stages = [f'{item["stages"].get(name, {}).get("seconds", 0.0):>10.3f}' for name in names]
+        lines.append(' '.join([f'{item["seconds"]:>10.3f}', *stages, item['file']]))
+    return '\n'.join(lines)
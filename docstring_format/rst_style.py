@@ -0,0 +1,63 @@
+"""Apply formatting of reStructuredText style to docstring"""
+import re
+from typing import TYPE_CHECKING
+
+from .numpy_style import collapse_blank_lines, indent_lines, keep_section
+from .profiling import stage
+from .utils import INDENT, SectionType, compile_pattern
+
+if TYPE_CHECKING:
+    from .base import DocstringSection
+
+FIELD = re.compile(r'^\s*:(param|type|returns?|rtype)\b')
+TYPE_FIELD = re.compile(r'^:(type|rtype)\b')
+RETURNS_FIELD = re.compile(r'^:returns?:\s*(.*)$')
+
+
+def detect_rst_style(lines: list[str]) -> bool:
+    """True if a line of the docstring is a field such as `:param name:` or `:returns:`."""
+    return any(FIELD.match(line) for line in lines)
+
+
+def rst_argument_token(name: str) -> str:
+    """Token starting the line describing the argument name."""
+    return f':param {name}:'
+
+
+def describe_rst_section(section: 'DocstringSection', lines: list[str]) -> list[str]:
+    """Description of a section written in reStructuredText style, without its field markers and types."""
+    if section.type == SectionType.SUMMARY:
+        return lines
+    if section.type in (SectionType.PARAMETER_DELIMITER, SectionType.OTHER):
+        return []
+
+    lines = [line for line in lines if not TYPE_FIELD.match(line)]
+    if not lines:
+        return lines
+    if section.type == SectionType.RETURNS:
+        match = RETURNS_FIELD.match(lines[0])
+    else:
+        match = compile_pattern(rf'^:param\s+(?:[^:]*\s)?{re.escape(section.name)}:\s*(.*)$').match(lines[0])
+    first = match.group(1) if match else lines[0]
+    return [first, *lines[1:]] if first else lines[1:]
+
+
+@stage('cleaning')
+def render_rst_section(section: 'DocstringSection', description: list[str], offset: str) -> list[str]:
+    """Render a section in reStructuredText style from its description, offset is the indentation of the docstring."""
+    if section.type == SectionType.SUMMARY:
+        return indent_lines(collapse_blank_lines(description), offset)
+    if section.type == SectionType.PARAMETER_DELIMITER:
+        return ['']
+    if section.type == SectionType.OTHER:
+        return keep_section(section)
+
+    first, *rest = description or ['']
+    rest = indent_lines(rest, offset + INDENT)
+    if section.type == SectionType.ARG:
+        lines = [offset + f':param {section.name}: {first}'.rstrip(), *rest]
+        type_field = f':type {section.name}: {section.annotation}'
+    else:
+        lines = [offset + f':returns: {first}', *rest] if description else []
+        type_field = f':rtype: {section.annotation}'
+    return [*lines, offset + type_field] if section.annotation else lines
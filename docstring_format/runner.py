@@ -0,0 +1,229 @@
+"""Implements the formatting of many script files at once."""
+import concurrent.futures
+import difflib
+import glob
+import os
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from .base import ScriptFile, edit_path, replace_file
+from .profiling import per_file, stage
+from .utils import DocstringStyle, LineRange
+
+if TYPE_CHECKING:
+    from .cache import CleanCache
+
+
+@dataclass
+class FileReport:
+    """Outcome of the formatting of a single script file."""
+    file_path: str
+    error: Optional[str] = None
+    function: Optional[str] = None  # in check mode, first function whose docstring is not clean
+    lineno: Optional[int] = None
+    profile: Optional[dict] = None  # seconds spent on the file and per stage, when profiling is enabled
+
+    @property
+    def ok(self) -> bool:
+        """True if the file was formatted without error."""
+        return self.error is None
+
+    @property
+    def clean(self) -> bool:
+        """True if the file was checked without error and all its docstrings are clean."""
+        return self.ok and self.function is None
+
+
+@dataclass
+class SourceReport:
+    """Outcome of the cleaning of a source held in memory."""
+    name: str
+    cleaned: Optional[str] = None
+    diff: Optional[str] = None  # unified diff from the source to the cleaned text, empty if unchanged
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the source was cleaned without error."""
+        return self.error is None
+
+    @property
+    def changed(self) -> bool:
+        """True if the source was cleaned without error and its cleaned text differs."""
+        return self.ok and bool(self.diff)
+
+
+def collect_files(paths: Iterable[str], pattern: str = '*.py') -> list[str]:
+    """Expand directories and glob patterns into a sorted list of python scripts.
+
+    Directories are searched recursively for files matching pattern. Files produced by a previous run (`_edit.py`)
+    are skipped, unless they are explicitly given."""
+    files = set()
+    for path in paths:
+        item = Path(path)
+        if item.is_file():
+            files.add(str(item))
+            continue
+        if item.is_dir():
+            candidates = item.rglob(pattern)
+        else:
+            candidates = map(Path, glob.glob(path, recursive=True))
+        files.update(str(candidate) for candidate in candidates
+                     if candidate.is_file() and not candidate.name.endswith('_edit.py'))
+    return sorted(files)
+
+
+@stage('io')
+def read_script(file_path: str) -> str:
+    """Read a script file, its line terminators are kept."""
+    with open(file_path, newline='') as file:
+        return file.read()
+
+
+@stage('io')
+def write_script(file_path: str, raw_text: str, cleaned: str, in_place: bool = False):
+    """Write the cleaned script in its edit file, or in place if it differs from raw_text."""
+    if not in_place:
+        edit_path(file_path).write_text(cleaned, newline='')
+    elif cleaned != raw_text:
+        replace_file(file_path, lambda file: file.write(cleaned))
+
+
+@per_file
+def format_file(file_path: str, line_ranges: Optional[list[LineRange]] = None,
+                cache: Optional['CleanCache'] = None, stream: bool = False, in_place: bool = False,
+                style: DocstringStyle = DocstringStyle.NUMPY) -> FileReport:
+    """Format a single script file, errors are caught and reported instead of raised.
+
+    When a cache is provided, the script is only parsed if its content was not cleaned by a previous run. The cache is
+    not used when only the functions overlapping line_ranges are cleaned, nor with stream, which cleans the script one
+    docstring at a time with a bounded memory. With in_place, the script itself is replaced atomically, clean scripts
+    are not written at all. Docstrings are rendered in style, the one of the cache if any."""
+    style = cache.style if cache is not None else style
+    if line_ranges is not None:
+        cache = None
+    try:
+        if stream:
+            from .streaming import write_clean_streaming
+            write_clean_streaming(file_path, line_ranges, in_place, style)
+            return FileReport(file_path)
+
+        raw_text = read_script(file_path)
+        cleaned = cache.get(raw_text) if cache is not None else None
+        if cleaned is None:
+            cleaned = ScriptFile(file_path, raw_text, line_ranges, style).cleaned_text
+            if cache is not None:
+                cache.set(raw_text, cleaned)
+        write_script(file_path, raw_text, cleaned, in_place)
+    except Exception as error:
+        return FileReport(file_path, error=f'{type(error).__name__}: {error}')
+    return FileReport(file_path)
+
+
+@per_file
+def check_file(file_path: str, line_ranges: Optional[list[LineRange]] = None,
+               cache: Optional['CleanCache'] = None, style: DocstringStyle = DocstringStyle.NUMPY) -> FileReport:
+    """Check that the docstrings of a single script file are clean in style, nothing is written.
+
+    The check stops at the first docstring which is not clean, the function it belongs to is reported. Files known to
+    be clean from the cache are not parsed."""
+    style = cache.style if cache is not None else style
+    if line_ranges is not None:
+        cache = None
+    try:
+        raw_text = read_script(file_path)
+        if cache is not None and cache.get(raw_text) == raw_text:
+            return FileReport(file_path)
+
+        docstring = ScriptFile(file_path, raw_text, line_ranges, style).check()
+        if docstring is None:
+            if cache is not None:
+                cache.set(raw_text, raw_text)
+            return FileReport(file_path)
+    except Exception as error:
+        return FileReport(file_path, error=f'{type(error).__name__}: {error}')
+    return FileReport(file_path, function=docstring.function.name, lineno=docstring.function.lineno)
+
+
+def format_files(file_paths: list[str], workers: Optional[int] = None, cache: Optional['CleanCache'] = None,
+                 line_ranges: Optional[dict[str, list[LineRange]]] = None, check: bool = False,
+                 stream: bool = False, in_place: bool = False,
+                 style: DocstringStyle = DocstringStyle.NUMPY) -> list[FileReport]:
+    """Format script files across a pool of processes.
+
+    Reports are returned in the same order as file_paths whatever the order in which files are processed. When
+    workers is None, one process per cpu is used. The cache is pruned once all files are formatted. line_ranges maps
+    the absolute path of files to the ranges of lines to clean, files missing from it are cleaned entirely. With
+    check, files are only checked with check_file, with stream, they are cleaned with a bounded memory, with in_place,
+    they are replaced by their cleaned version. Docstrings are rendered in style."""
+    if check:
+        func = partial(check_file, cache=cache, style=style)
+    else:
+        func = partial(format_file, cache=cache, stream=stream, in_place=in_place, style=style)
+    ranges = [None] * len(file_paths)
+    if line_ranges is not None:
+        ranges = [line_ranges.get(os.path.abspath(file_path)) for file_path in file_paths]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(file_paths) <= 1:
+        reports = list(map(func, file_paths, ranges))
+    else:
+        # send files by chunks to limit inter process communication on large trees
+        chunksize = max(1, len(file_paths) // (4 * workers))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(func, file_paths, ranges, chunksize=chunksize))
+
+    if cache is not None:
+        cache.prune()
+    return reports
+
+
+def clean_source(item: tuple[str, str], cache: Optional['CleanCache'] = None,
+                 style: DocstringStyle = DocstringStyle.NUMPY) -> SourceReport:
+    """Clean a single (name, source) pair without touching the disk, errors are caught and reported instead of raised.
+
+    name is only used to report the source, it must end with `.py`. Docstrings are rendered in style, the one of the
+    cache if any."""
+    name, raw_text = item
+    style = cache.style if cache is not None else style
+    try:
+        cleaned = cache.get(raw_text) if cache is not None else None
+        if cleaned is None:
+            cleaned = ScriptFile(name, raw_text, style=style).cleaned_text
+            if cache is not None:
+                cache.set(raw_text, cleaned)
+    except Exception as error:
+        return SourceReport(name, error=f'{type(error).__name__}: {error}')
+    diff = '' if cleaned == raw_text else ''.join(difflib.unified_diff(
+        raw_text.splitlines(keepends=True), cleaned.splitlines(keepends=True), f'a/{name}', f'b/{name}'))
+    return SourceReport(name, cleaned, diff)
+
+
+def format_many(sources: Iterable[tuple[str, str]], workers: Optional[int] = 1, chunk_size: int = 256,
+                cache: Optional['CleanCache'] = None,
+                style: DocstringStyle = DocstringStyle.NUMPY) -> Iterator[SourceReport]:
+    """Clean (name, source) pairs held in memory and yield their reports in the same order, nothing is written.
+
+    sources may be any iterable, such as a generator reading blobs from a git object store. It is consumed by chunks
+    of chunk_size sources, so that only one chunk of sources and reports is held at a time. When workers is not 1,
+    each chunk is spread across a pool of processes, one per cpu when workers is None. Docstrings are rendered in
+    style. The cache is pruned once the reports are consumed, or when the generator is closed."""
+    func = partial(clean_source, cache=cache, style=style)
+    workers = workers or os.cpu_count() or 1
+    sources = iter(sources)
+    chunks = iter(lambda: list(islice(sources, chunk_size)), [])
+    try:
+        if workers == 1:
+            for chunk in chunks:
+                yield from map(func, chunk)
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in chunks:
+                yield from executor.map(func, chunk, chunksize=max(1, len(chunk) // (4 * workers)))
+    finally:
+        if cache is not None:
+            cache.prune()
@@ -0,0 +1,183 @@
+"""Implements the cleaning of very large scripts with a memory bounded by the size of a single function.
+
+The script is memory mapped and tokenized to locate the docstrings. Untouched regions are copied straight from the
+mapping to the output, only the signature and the docstring of one function are decoded and parsed at a time, so that
+the peak memory does not grow with the size of the script."""
+import ast
+import mmap
+import tokenize
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional
+
+from .base import Docstring, edit_path, replace_file
+from .utils import DocstringStyle, LineRange, overlaps
+
+COPY_CHUNK_SIZE = 2 ** 20  # in bytes
+
+# tokens after which a new statement starts
+STATEMENT_START_TOKENS = (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT, tokenize.ENCODING)
+# tokens which do not end a docstring statement
+IGNORED_TOKENS = (tokenize.NL, tokenize.COMMENT)
+
+
+@dataclass
+class DocstringSpan:
+    """Location of a function docstring in a script, lines are 1-based and inclusive."""
+    start: int  # first line of the decorators, the signature if there are none
+    def_line: int  # first line of the signature
+    def_col: int  # column of the `def` or `async` keyword
+    header_last: int  # line of the colon ending the signature
+    first: int  # first line of the docstring
+    last: int  # last line of the docstring
+
+
+def iter_docstring_spans(buffer: mmap.mmap) -> Iterator[DocstringSpan]:
+    """Yield the docstring spans of the functions of the script in source order, from its tokens.
+
+    Docstrings written on the same line as the signature are left out."""
+    statement_start = True
+    state = None  # None, 'signature', 'body' or 'docstring'
+    span = None
+    depth = 0
+    async_position = None
+    decorator_line = None  # first line of the decorators of the next statement
+    for token in tokenize.tokenize(buffer.readline):
+        at_statement_start, pending_async = statement_start, async_position
+        if token.type not in IGNORED_TOKENS:
+            is_async = token.type == tokenize.NAME and token.string == 'async' and at_statement_start
+            async_position = token.start if is_async else None
+            statement_start = token.type in STATEMENT_START_TOKENS or is_async
+
+        if state == 'signature':
+            if token.type == tokenize.OP and token.string in '([{':
+                depth += 1
+            elif token.type == tokenize.OP and token.string in ')]}':
+                depth -= 1
+            elif token.type == tokenize.OP and token.string == ':' and depth == 0:
+                span.header_last = token.start[0]
+                state = 'body'
+            continue
+
+        if state == 'body':
+            if token.type in (tokenize.NEWLINE, tokenize.INDENT) or token.type in IGNORED_TOKENS:
+                continue
+            state = None
+            if token.type == tokenize.STRING and token.start[0] > span.header_last:
+                span.first, span.last = token.start[0], token.end[0]
+                state = 'docstring'
+                continue
+
+        elif state == 'docstring':
+            if token.type == tokenize.STRING:  # implicit concatenation
+                span.last = token.end[0]
+                continue
+            if token.type in IGNORED_TOKENS:
+                continue
+            state = None
+            if token.type == tokenize.NEWLINE:
+                yield span
+
+        if token.type == tokenize.NAME and token.string == 'def' and at_statement_start:
+            line, col = pending_async or token.start
+            start = line if decorator_line is None else decorator_line
+            span = DocstringSpan(start=start, def_line=line, def_col=col, header_last=0, first=0, last=0)
+            state, depth, decorator_line = 'signature', 0, None
+        elif at_statement_start and token.type not in IGNORED_TOKENS + STATEMENT_START_TOKENS:
+            if token.type == tokenize.OP and token.string == '@':
+                decorator_line = decorator_line or token.start[0]
+            elif token.type != tokenize.NAME or token.string != 'async':
+                decorator_line = None
+
+
+class LineCursor:
+    """Byte offsets of the lines of a buffer, lines must be requested in increasing order."""
+
+    def __init__(self, buffer: mmap.mmap):
+        self.buffer = buffer
+        self.line = 1
+        self.offset = 0
+
+    def offset_of(self, line: int) -> int:
+        """Offset of the start of line (1-based), the size of the buffer past its end."""
+        while self.line < line and self.offset < len(self.buffer):
+            end = self.buffer.find(b'\n', self.offset)
+            self.offset = len(self.buffer) if end == -1 else end + 1
+            self.line += 1
+        return self.offset
+
+
+def read_lines(buffer: mmap.mmap, start: int, end: int, encoding: str) -> list[str]:
+    """Decode the lines held between the offsets start and end, without their line terminators."""
+    text = buffer[start:end].decode(encoding)
+    return [line.removesuffix('\r') for line in text.removesuffix('\n').split('\n')]
+
+
+def line_terminator(buffer: mmap.mmap, end: int) -> bytes:
+    """Line terminator of the line ending at the offset end, empty at the end of a file without trailing new line."""
+    if buffer[max(end - 2, 0):end] == b'\r\n':
+        return b'\r\n'
+    return b'\n' if buffer[end - 1:end] == b'\n' else b''
+
+
+def parse_header(lines: list[str], def_col: int) -> ast.AST:
+    """Parse a function signature alone, the function body is replaced by a pass statement."""
+    source = '\n'.join([lines[0][def_col:], *lines[1:]])
+    return ast.parse(source + '\n    pass\n').body[0]
+
+
+def stream_clean(file_path: str, output: BinaryIO, line_ranges: Optional[list[LineRange]] = None,
+                 style: DocstringStyle = DocstringStyle.NUMPY) -> int:
+    """Write the cleaned script into the binary file output, one docstring at a time.
+
+    With line_ranges, only the docstrings of functions whose decorators, signature or docstring overlap one of the
+    ranges are cleaned, as in ScriptFile. Docstrings are rendered in style. Bytes outside the cleaned docstrings, line
+    terminators included, are copied unchanged. Returns the number of docstrings which were not clean."""
+    changed = 0
+    with open(file_path, 'rb') as file:
+        if not file.seek(0, 2):  # empty files cannot be mapped
+            return changed
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer, memoryview(buffer) as view:
+            encoding, _ = tokenize.detect_encoding(buffer.readline)
+            buffer.seek(0)
+
+            cursor = LineCursor(buffer)
+            position = 0
+            for span in iter_docstring_spans(buffer):
+                if line_ranges is not None and not overlaps(span.start, span.last, line_ranges):
+                    continue
+
+                def_start = cursor.offset_of(span.def_line)
+                header_end = cursor.offset_of(span.header_last + 1)
+                header = read_lines(buffer, def_start, header_end, encoding)
+                start = cursor.offset_of(span.first)
+                end = cursor.offset_of(span.last + 1)
+                lines = read_lines(buffer, start, end, encoding)
+
+                docstring = Docstring(parse_header(header, span.def_col), lines, span.first - 1, len(lines))
+                for chunk_start in range(position, start, COPY_CHUNK_SIZE):
+                    output.write(view[chunk_start:min(chunk_start + COPY_CHUNK_SIZE, start)])
+
+                # keep the line terminators of the original docstring
+                terminator = line_terminator(buffer, end)
+                newline = (terminator or b'\n').decode()
+                cleaned = docstring.clean(style)
+                changed += cleaned != lines
+                output.write(newline.join(cleaned).encode(encoding) + terminator)
+                position = end
+
+            for chunk_start in range(position, len(buffer), COPY_CHUNK_SIZE):
+                output.write(view[chunk_start:min(chunk_start + COPY_CHUNK_SIZE, len(buffer))])
+    return changed
+
+
+def write_clean_streaming(file_path: str, line_ranges: Optional[list[LineRange]] = None,
+                          in_place: bool = False, style: DocstringStyle = DocstringStyle.NUMPY) -> bool:
+    """Write the cleaned script in its edit file, as ScriptFile.write_clean does, with a bounded memory.
+
+    With in_place, the script is replaced atomically, and only if one of its docstrings was not clean. Returns
+    whether a file was written."""
+    if in_place:
+        return replace_file(file_path, lambda output: stream_clean(file_path, output, line_ranges, style) > 0, 'wb')
+    with edit_path(file_path).open('wb') as output:
+        stream_clean(file_path, output, line_ranges, style)
+    return True
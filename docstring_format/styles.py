@@ -0,0 +1,69 @@
+"""Implements the registry of docstring styles.
+
+Each style plugs in a detector, the tokens starting its sections, an extractor of the description of a section written
+in that style and a renderer of a section into that style. Docstrings are parsed and split into sections once, in their
+own style, then rendered into any registered style from those sections."""
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+from .google_style import describe_google_section, detect_google_style, render_google_section
+from .numpy_style import apply_numpy_style, describe_numpy_section, detect_numpy_style, render_numpy_section
+from .rst_style import describe_rst_section, detect_rst_style, render_rst_section, rst_argument_token
+from .utils import DELIMITERS, OTHER_HEADER, DocstringStyle
+
+if TYPE_CHECKING:
+    from .base import DocstringSection
+
+DEFAULT_STYLE = DocstringStyle.NUMPY  # style of docstrings matched by no detector
+
+
+@dataclass(frozen=True)
+class Style:
+    """Docstring style plugged in the registry."""
+    name: DocstringStyle
+    detect: Callable[[Sequence[str]], bool]  # True if the docstring lines are written in this style
+    describe: Callable[['DocstringSection', list[str]], list[str]]  # description of a section written in this style
+    render: Callable[['DocstringSection', list[str], str], list[str]]  # section rendered from a description
+    param_tokens: tuple[str, ...] = ()
+    returns_tokens: tuple[str, ...] = ()
+    argument_token: Callable[[str], str] = str  # token starting the line describing an argument
+    clean: Optional[Callable[['DocstringSection'], list[str]]] = None  # clean sections already in this style
+    other_header: Optional[re.Pattern] = None  # header of the sections kept as written, its indentation in group 1
+
+
+STYLES: dict[DocstringStyle, Style] = {}
+
+
+def register_style(style: Style):
+    """Add a style to the registry, styles are detected in registration order."""
+    STYLES[style.name] = style
+
+
+def get_style(name: DocstringStyle) -> Style:
+    """Registered style, ValueError is raised for styles not registered."""
+    if name not in STYLES:
+        raise ValueError(f'{name.name} docstrings are not supported')
+    return STYLES[name]
+
+
+def detect_style(lines: Sequence[str]) -> DocstringStyle:
+    """Style of the docstring lines, the default style if no detector matches."""
+    for style in STYLES.values():
+        if style.detect(lines):
+            return style.name
+    return DEFAULT_STYLE
+
+
+register_style(Style(DocstringStyle.NUMPY, detect_numpy_style, describe_numpy_section, render_numpy_section,
+                     param_tokens=DELIMITERS[DocstringStyle.NUMPY]['param'],
+                     returns_tokens=DELIMITERS[DocstringStyle.NUMPY]['returns'],
+                     clean=apply_numpy_style, other_header=OTHER_HEADER))
+register_style(Style(DocstringStyle.GOOGLE, detect_google_style, describe_google_section, render_google_section,
+                     param_tokens=DELIMITERS[DocstringStyle.GOOGLE]['param'],
+                     returns_tokens=DELIMITERS[DocstringStyle.GOOGLE]['returns'],
+                     other_header=OTHER_HEADER))
+register_style(Style(DocstringStyle.RST, detect_rst_style, describe_rst_section, render_rst_section,
+                     param_tokens=DELIMITERS[DocstringStyle.RST]['param'],
+                     returns_tokens=DELIMITERS[DocstringStyle.RST]['returns'],
+                     argument_token=rst_argument_token, other_header=OTHER_HEADER))
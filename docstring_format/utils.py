@@ -1,5 +1,8 @@
 import re
+from collections.abc import Sequence
 from enum import Enum, auto
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 
 
 class DocstringStyle(Enum):
@@ -13,19 +16,116 @@ class SectionType(Enum):
     SUMMARY = auto()
     RETURNS = auto()
     PARAMETER_DELIMITER = auto()
+    OTHER = auto()  # kept as written, such as a google `Raises:` block
 
 
-DELIMITERS = {DocstringStyle.NUMPY: {'param': 'Parameters', 'returns': 'Returns'}}
+# tokens starting the parameters and returns sections, in each style
+DELIMITERS = {DocstringStyle.NUMPY: {'param': ('Parameters',), 'returns': ('Returns',)},
+              DocstringStyle.GOOGLE: {'param': ('Args:', 'Arguments:', 'Parameters:'), 'returns': ('Returns:',)},
+              DocstringStyle.RST: {'param': (), 'returns': (':returns:', ':return:', ':rtype:')}}
+INDENT = '    '
+# header of the sections kept as written in any style, such as `Raises:` or `Raises` above dashes, with its indentation
+OTHER_HEADER = re.compile(r'^(\s*)(Yields|Raises|Warns|Examples?|Notes?|Attributes|Todo|Warnings?|See Also|References)'
+                          r':?\s*$')
+
+PATTERN_CACHE_SIZE = 1024
+ANNOTATION_CACHE_SIZE = 4096
+DEFAULT_CACHE_DIR = '.docstring_format_cache'
+
+LineRange = tuple[int, int]  # first and last line, 1-based and inclusive
 
 
 # PARAMETERS_DELIMITERS_REGEX = {DocstringStyle.NUMPY: 'Parameters\n\s*-+\n'}
 # RETURNS_DELIMITERS_REGEX = {DocstringStyle.NUMPY: 'Returns\s*-+\n'}
 
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compile patterns built at runtime (from argument names, annotations...) once, within a bounded LRU cache."""
+    return re.compile(pattern)
+
+
+EMPTY_LINE = re.compile(r'^\s*$')  # match a line of whitespace
+NEWLINE = re.compile(r'\r\n|\r|\n')  # line terminators counted by the tokenizer, unlike str.splitlines
+LEADING_WHITESPACE = re.compile(r'(\s*)')
+
+
 def is_empty_line(line):
-    match = re.search('^\s*$', line)  # match a line of whitespace
+    match = EMPTY_LINE.search(line)
     return match
 
 
-DOCSTRING_TAGS = {'first': '(\s*)["\']{3}(.*)',  # match `whitespaces"""description`
-                  'last': '(\s*)(.*)["\']{3}',
-                  'generic': '["\']{3}'}  # match `whitespaces description"""`
+DOCSTRING_TAGS = {'first': r'(\s*)["\']{3}(.*)',  # match `whitespaces"""description`
+                  'last': r'(\s*)(.*)["\']{3}',
+                  'generic': r'["\']{3}'}  # match `whitespaces description"""`
+DOCSTRING_TAGS_REGEX = {key: re.compile(pattern) for key, pattern in DOCSTRING_TAGS.items()}
+
+
+def split_lines(text: str) -> list[str]:
+    """Lines of text as numbered by ast, a form feed or a unicode line separator does not end a line."""
+    lines = NEWLINE.split(text)
+    if lines[-1] == '':
+        lines.pop()
+    return lines
+
+
+def detect_newline(text: str) -> str:
+    """First line terminator of text, a new line if it has a single line."""
+    match = NEWLINE.search(text)
+    return '\n' if match is None else match.group()
+
+
+def overlaps(first: int, last: int, ranges: Iterable[LineRange]) -> bool:
+    """True if the lines from first to last overlap one of the ranges."""
+    return any(start <= last and first <= end for start, end in ranges)
+
+
+class LineView(Sequence):
+    """Read only view on the lines source[start:start + length], sharing the source list instead of copying it.
+
+    Views compare equal to lists holding the same lines, slicing a view returns a view on the same source and deep
+    copies (as done by dataclasses.asdict) are plain lists."""
+    __slots__ = ('source', 'start', 'length')
+
+    def __init__(self, source: Sequence[str], start: int = 0, length: Optional[int] = None):
+        available = max(0, len(source) - start)
+        length = available if length is None else max(0, min(length, available))
+        if isinstance(source, LineView):  # views on views share the underlying source
+            source, start = source.source, source.start + start
+        self.source = source
+        self.start = start
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step != 1:
+                return list(self)[index]
+            return LineView(self.source, self.start + start, stop - start)
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('line index out of range')
+        return self.source[self.start + index]
+
+    def __iter__(self) -> Iterator[str]:
+        # a slice copies the references of this view only, islice would walk the source from its first line
+        return iter(self.source[self.start:self.start + self.length])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, LineView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __copy__(self) -> 'LineView':
+        return LineView(self.source, self.start, self.length)
+
+    def __deepcopy__(self, memo) -> list[str]:
+        return list(self)
@@ -1,3 +1,7 @@
 from .base import BinaryNode, ConstantNode, Node, UnaryNode, VariableNode
+from .batch import BatchEvaluator, BatchReport
+from .compiler import Kernel
 from .constants import Operators
 from .from_ast import from_string
+from .optimize import simplify
+from .streaming import eval_file, read_chunks, stream_eval, write_chunks
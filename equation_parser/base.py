@@ -1,15 +1,25 @@
 """Implement base object that constitutes the tree of computation"""
 from collections import OrderedDict
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 import pandas as pd
 
 from .constants import RESERVED_NAME, NodeType, Operators
 
+if TYPE_CHECKING:
+    from .compiler import Kernel
+
 
 class Node:
     """Basic structure for all nodes"""
 
+    _frozen = False
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(f"{self.__class__.__name__} is frozen")
+        super().__setattr__(name, value)
+
     def __repr__(self, level=0):
         if level == 0:
             sep = ""
@@ -25,6 +35,32 @@ class Node:
         """Serialize to dict"""
         raise NotImplementedError
 
+    def children(self) -> tuple["Node", ...]:
+        """Child nodes, whose values are the operands of this node"""
+        return ()
+
+    def variables(self) -> list[str]:
+        """Names of the variables referenced by the tree, by order of appearance"""
+        names = []
+        for child in self.children():
+            for name in child.variables():
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def freeze(self) -> "Node":
+        """Make the tree starting at this node immutable and return it"""
+        for child in self.children():
+            child.freeze()
+        object.__setattr__(self, "_frozen", True)
+        return self
+
+    def compile(self) -> "Kernel":
+        """Lower the tree once into a kernel over numpy arrays, called as eval"""
+        from .compiler import Kernel
+
+        return Kernel(self)
+
     def __eq__(self, other: "Node"):
         return self.serialize() == other.serialize()
 
@@ -50,6 +86,10 @@ class UnaryNode(Node):
         """Apply func to value"""
         return self.func(self.value.eval(datas, *args, **kwargs), *args, **kwargs)
 
+    def children(self) -> tuple[Node, ...]:
+        """Operand of func"""
+        return (self.value,)
+
     def serialize(self) -> OrderedDict:
         """Serialize to Ordered dict"""
         return OrderedDict(
@@ -87,6 +127,10 @@ class BinaryNode(Node):
             self.right.eval(datas, *args, **kwargs),
         )
 
+    def children(self) -> tuple[Node, ...]:
+        """Left and right operands of func"""
+        return self.left, self.right
+
     def serialize(self) -> OrderedDict:
         return OrderedDict(
             [
@@ -126,7 +170,8 @@ class ConstantNode(TerminalNode):
 
     def eval(self, datas: pd.DataFrame, *args, **kwargs):
         """Return value"""
-        if self.value in RESERVED_NAME.keys():
+        # reserved names are already resolved in trees built by from_string
+        if isinstance(self.value, str) and self.value in RESERVED_NAME:
             return RESERVED_NAME[self.value]
         return self.value
 
@@ -142,6 +187,10 @@ class VariableNode(TerminalNode):
         """Return the columns in datas named value"""
         return datas[self.value]
 
+    def variables(self) -> list[str]:
+        """Name of the variable"""
+        return [self.value]
+
     def serialize(self) -> OrderedDict:
         """Serialize as OrderedDict"""
         return OrderedDict([("section_type", NodeType.Variable), ("value", self.value)])
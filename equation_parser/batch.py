@@ -0,0 +1,85 @@
+"""Evaluate many trees at once, computing their common subexpressions once"""
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+import pandas as pd
+
+from .base import Node
+
+
+@dataclass
+class BatchReport:
+    """Number of node evaluations of a batch per DataFrame"""
+
+    nodes: int  # evaluated by Node.eval of each tree
+    evaluations: int  # distinct subexpressions, evaluated by the batch
+
+    @property
+    def saved(self) -> int:
+        """Evaluations saved by the batch"""
+        return self.nodes - self.evaluations
+
+
+class BatchEvaluator:
+    """Evaluate many trees over the same datas, sharing their common subexpressions.
+
+    Subtrees are identified by their serialized structure, each distinct one is
+    evaluated once per DataFrame in an order where its operands come first.
+    """
+
+    def __init__(self, trees: Iterable[Node]):
+        self.trees = list(trees)
+        self.nodes: list[Node] = []  # distinct subexpressions, operands first
+        self.operands: list[tuple[int, ...]] = []
+        self._indexes: dict[tuple, int] = {}
+        self.report = BatchReport(0, 0)
+        self.roots = [self._add(tree, tree.serialize()) for tree in self.trees]
+        self.report.evaluations = len(self.nodes)
+
+    def _add(self, node: Node, serialized: Mapping) -> int:
+        """Index of the subexpression node, added with its operands if not known yet.
+
+        The key of a subexpression is its serialized form, where operands are replaced
+        by their own index and values are given with their type, 2 and 2.0 being
+        different subexpressions.
+        """
+        self.report.nodes += 1
+        children = iter(node.children())
+        key, operands = [], []
+        for name, value in serialized.items():
+            if isinstance(value, Mapping):
+                operands.append(self._add(next(children), value))
+                key.append((name, operands[-1]))
+            else:
+                key.append((name, type(value), value))
+        key = tuple(key)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = len(self.nodes)
+            self.nodes.append(node)
+            self.operands.append(tuple(operands))
+        return index
+
+    def eval(self, datas: pd.DataFrame, *args, **kwargs) -> list:
+        """Evaluate all trees over datas, results are in the same order as trees.
+
+        Trees of the same structure get distinct copies of their value, so that modifying
+        the result of one of them does not change the others.
+        """
+        values = []
+        for node, operands in zip(self.nodes, self.operands):
+            if not operands:
+                value = node.eval(datas, *args, **kwargs)
+            elif len(operands) == 1:  # as UnaryNode.eval
+                value = node.func(values[operands[0]], *args, **kwargs)
+            else:  # as BinaryNode.eval
+                value = node.func(*(values[index] for index in operands))
+            values.append(value)
+        results, returned = [], set()
+        for index in self.roots:
+            value = values[index]
+            if index in returned and hasattr(value, 'copy'):
+                value = value.copy()
+            returned.add(index)
+            results.append(value)
+        return results
@@ -0,0 +1,171 @@
+"""Lower a tree of computation into a flat kernel over numpy arrays"""
+
+from typing import Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .base import BinaryNode, ConstantNode, Node, UnaryNode, VariableNode
+from .constants import RESERVED_NAME, Operators
+
+# Operators computed by a ufunc writing to a scratch buffer, the others are applied
+# to Series as in eval
+UFUNCS = {
+    Operators.ADD: np.add,
+    Operators.SUB: np.subtract,
+    Operators.MUL: np.multiply,
+    Operators.DIV: np.true_divide,
+    Operators.POW: np.power,
+    Operators.NEG: np.negative,
+    Operators.SIN: np.sin,
+    Operators.COS: np.cos,
+    Operators.TAN: np.tan,
+    Operators.ABS: np.absolute,
+    Operators.EXP: np.exp,
+    Operators.SQRT: np.sqrt,
+}
+
+
+def empty_like(value):
+    """Empty array of the dtype of value if it is an array, value itself otherwise"""
+    return np.empty(0, value.dtype) if isinstance(value, np.ndarray) else value
+
+
+# Kinds of slot read and written by the instructions
+VARIABLE, CONSTANT, BUFFER = range(3)
+
+
+class Kernel:
+    """Flat program computing a tree of computation over numpy arrays.
+
+    The tree is lowered once into instructions in evaluation order, each one applying a
+    ufunc to its input slots with `out=` a scratch buffer. A buffer is freed as soon as
+    its value is consumed, so that a tree needs as few buffers as its shape allows. They
+    are allocated on the first call and reused while the number of rows and the dtypes
+    are unchanged, a kernel must therefore not be called from several threads at once.
+    Each value has the dtype eval would give it, as the ufuncs are the ones eval calls.
+    """
+
+    def __init__(self, node: Node):
+        self.node = node
+        self.variables: list[str] = []
+        self.constants: list = []
+        self.instructions: list[tuple] = []
+        self.n_buffers = 0
+        self._free: list[int] = []
+        self.result = self._lower(node)
+        self._buffers: dict[tuple[int, np.dtype], np.ndarray] = {}
+
+    def _slot(self, kind: int, value) -> tuple[int, int]:
+        """Slot of a variable or a constant, shared by all instructions reading it"""
+        values = self.variables if kind == VARIABLE else self.constants
+        for index, item in enumerate(values):
+            if type(item) is type(value) and item == value:
+                return kind, index
+        values.append(value)
+        return kind, len(values) - 1
+
+    def _buffer(self, inputs: tuple) -> tuple[int, int]:
+        """Free the buffers read by an instruction and return the one it writes to"""
+        self._free.extend(index for kind, index in inputs if kind == BUFFER)
+        if self._free:
+            return BUFFER, self._free.pop()
+        self.n_buffers += 1
+        return BUFFER, self.n_buffers - 1
+
+    def _lower(self, node: Node) -> tuple[int, int]:
+        """Append the instructions computing node and return the slot of its value"""
+        if isinstance(node, VariableNode):
+            return self._slot(VARIABLE, node.value)
+        if isinstance(node, ConstantNode):
+            return self._slot(CONSTANT, RESERVED_NAME.get(node.value, node.value))
+        if isinstance(node, UnaryNode):
+            if node.func_type == Operators.ID:
+                return self._lower(node.value)
+            inputs = (self._lower(node.value),)
+        elif isinstance(node, BinaryNode):
+            inputs = (self._lower(node.left), self._lower(node.right))
+        else:
+            raise TypeError(f"Cannot compile {node.__class__.__name__}")
+
+        ufunc = UFUNCS.get(node.func_type)
+        if ufunc is not None and all(kind == CONSTANT for kind, _ in inputs):
+            # constant subtrees are computed once, while lowering, by the operator eval
+            # applies to them. If it fails, such as a division by zero, the operator is
+            # applied again on each call, so that the error is raised as by eval
+            try:
+                value = node.func(*(self.constants[index] for _, index in inputs))
+            except (ArithmeticError, ValueError):
+                ufunc = None
+            else:
+                # kept a python scalar, which does not promote the dtype of arrays
+                if isinstance(value, np.generic):
+                    value = value.item()
+                return self._slot(CONSTANT, value)
+        out = self._buffer(inputs)
+        self.instructions.append((ufunc or node.func, inputs, out, ufunc is not None))
+        return out
+
+    def _get_buffer(self, index: int, length: int, dtype: np.dtype) -> np.ndarray:
+        """Scratch buffer of length rows and dtype, allocated again if length changed"""
+        buffer = self._buffers.get((index, dtype))
+        if buffer is None or len(buffer) != length:
+            buffer = self._buffers[index, dtype] = np.empty(length, dtype)
+        return buffer
+
+    def run(
+        self,
+        columns: Mapping[str, np.ndarray],
+        index: Optional[pd.Index] = None,
+        *args,
+        **kwargs,
+    ):
+        """Compute the tree from the columns of the variables it references.
+
+        Operators which are not ufuncs, such as delta, or whose constant operands could not
+        be folded, are given Series on index along with args and kwargs for unary ones, as
+        in eval. The result is a new array, or a scalar if the tree references no variable.
+        """
+        variables = [np.asarray(columns[name]) for name in self.variables]
+        kind, result = self.result
+        if kind == CONSTANT:
+            return self.constants[result]
+        if not variables:
+            return self.node.eval(None, *args, **kwargs)
+        if kind == VARIABLE:
+            return variables[result].copy()
+
+        length = len(variables[0])
+        buffers = [None] * self.n_buffers
+        slots = (variables, self.constants, buffers)
+        last = len(self.instructions) - 1
+        for position, (func, inputs, (_, out), is_ufunc) in enumerate(
+            self.instructions
+        ):
+            values = [slots[kind][index] for kind, index in inputs]
+            if not is_ufunc:
+                values = [
+                    pd.Series(value, index=index) if np.ndim(value) else value
+                    for value in values
+                ]
+                # as in eval, only unary operators are given args and kwargs
+                if len(values) == 1:
+                    buffers[out] = np.asarray(func(*values, *args, **kwargs))
+                else:
+                    buffers[out] = np.asarray(func(*values))
+                continue
+            # dtype resolved by the ufunc from the dtypes of its inputs, as in eval
+            dtype = func(*(empty_like(value) for value in values)).dtype
+            if position == last:  # not a buffer, which is overwritten by the next call
+                target = np.empty(length, dtype)
+            else:
+                target = self._get_buffer(out, length, dtype)
+            buffers[out] = func(*values, out=target)
+        return buffers[result]
+
+    def __call__(self, datas: pd.DataFrame, *args, **kwargs) -> Union[pd.Series, float]:
+        """Compute the tree over datas, the result is a Series on its index"""
+        result = self.run(datas, datas.index, *args, **kwargs)
+        if isinstance(result, np.ndarray):
+            return pd.Series(result, index=datas.index, copy=False)
+        return result
@@ -8,6 +8,9 @@ from .functions import delta, identity, relative_percentage
 
 RESERVED_NAME = {"pi": math.pi}
 
+# Maximum number of trees cached by from_string
+PARSE_CACHE_SIZE = 1024
+
 
 class NodeType(str, Enum):
     """Convenience enumeration of node section_type"""
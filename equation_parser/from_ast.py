@@ -1,10 +1,13 @@
 import ast
+import logging
+from functools import lru_cache
 from typing import Union
 
 from structlog import getLogger
 
 from .base import BinaryNode, ConstantNode, Node, UnaryNode, VariableNode
-from .constants import RESERVED_NAME, Operators
+from .constants import PARSE_CACHE_SIZE, RESERVED_NAME, Operators
+from .optimize import simplify
 
 logger = getLogger()
 
@@ -32,16 +35,12 @@ OPERATORS_MAP = {
 
 def eval_node(ast_node: Union[ast.Constant, ast.Name, ast.BinOp, ast.UnaryOp]) -> Node:
     """Evaluate and dispatch to one of eval method depending on the section_type of ast_node"""
-    log = logger.bind(func="eval node")
-    log.debug(ast_node)
     func = AST_EVALUATORS[type(ast_node)]
     return func(ast_node)
 
 
 def eval_binop(ast_node: ast.BinOp) -> BinaryNode:
     """Defines a binary node"""
-    log = logger.bind(func="eval binop")
-    log.debug(ast.dump(ast_node))
     op_type = OPERATORS_MAP[type(ast_node.op)]
     return BinaryNode(
         left=eval_node(ast_node.left),
@@ -52,8 +51,6 @@ def eval_binop(ast_node: ast.BinOp) -> BinaryNode:
 
 def eval_constant(ast_node: Union[ast.Constant, ast.Num]) -> ConstantNode:
     """Defines a constant node"""
-    log = logger.bind(func="eval constant")
-    log.debug(ast.dump(ast_node))
     if isinstance(ast_node, ast.Constant):
         return ConstantNode(value=ast_node.value)
     else:
@@ -62,8 +59,6 @@ def eval_constant(ast_node: Union[ast.Constant, ast.Num]) -> ConstantNode:
 
 def eval_name(ast_node: ast.Name) -> Union[VariableNode, ConstantNode]:
     """Defines a variable node"""
-    log = logger.bind(func="eval name")
-    log.debug(ast.dump(ast_node))
     if ast_node.id in RESERVED_NAME.keys():
         return ConstantNode(value=ast_node.id)
     else:
@@ -72,31 +67,40 @@ def eval_name(ast_node: ast.Name) -> Union[VariableNode, ConstantNode]:
 
 def eval_unaryop(ast_node: ast.UnaryOp) -> UnaryNode:
     """Defines a unary operation node"""
-    log = logger.bind(func="eval unary")
-    log.debug(ast.dump(ast_node))
     op_type = OPERATORS_MAP[type(ast_node.op)]
     return UnaryNode(func_type=op_type, value=eval_node(ast_node.operand))
 
 
 def eval_call(ast_node: ast.Call) -> UnaryNode:
     """Evaluate function call, mainly supports unary function such as sin and cos"""
-    log = logger.bind(func="eval Call")
-    log.debug(ast.dump(ast_node))
     op_type = OPERATORS_MAP[ast_node.func.id.lower()]
     arg = ast_node.args[0]
     return UnaryNode(func_type=op_type, value=eval_node(arg))
 
 
+def debug_enabled() -> bool:
+    """False if the configured logger drops debug messages, whose content is not built"""
+    is_enabled_for = getattr(logger, "is_enabled_for", None)
+    return is_enabled_for is None or is_enabled_for(logging.DEBUG)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def from_string(equation_string: str) -> Node:
-    """Build a tree starting from an equation string"""
-    log = logger.bind(func="build tree")
-    log.debug("Start building")
+    """Build a tree starting from an equation string.
+
+    Trees are cached by equation string, the same frozen tree is returned for the same
+    string, see `from_string.cache_info()` for the hits and misses of the cache. A tree
+    which can be modified is built by `Node.from_dict(tree.serialize())`. Trees are
+    simplified, see optimize.simplify.
+    """
     ast_node = ast.parse(equation_string, "<string>", mode="eval")
+    if debug_enabled():
+        logger.debug(ast.dump(ast_node), func="build tree", equation=equation_string)
     if isinstance(ast_node, ast.Expression):
         node_value = ast_node.body
     else:
         node_value = ast_node
-    return eval_node(node_value)
+    return simplify(eval_node(node_value)).freeze()
 
 
 AST_EVALUATORS = {
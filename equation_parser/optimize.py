@@ -0,0 +1,78 @@
+"""Simplify a tree of computation before it is evaluated"""
+import numpy as np
+
+from .base import BinaryNode, ConstantNode, Node, UnaryNode
+from .constants import RESERVED_NAME, Operators
+
+# Operators folded when all their operands are constants, the others expect datas
+FOLDED = {
+    Operators.ADD,
+    Operators.SUB,
+    Operators.MUL,
+    Operators.DIV,
+    Operators.POW,
+    Operators.NEG,
+    Operators.SIN,
+    Operators.COS,
+    Operators.TAN,
+    Operators.ABS,
+    Operators.EXP,
+    Operators.SQRT,
+}
+
+def is_number(node: Node) -> bool:
+    """True if node is a numeric constant"""
+    if not isinstance(node, ConstantNode):
+        return False
+    return isinstance(node.value, (int, float, complex))
+
+
+def fold(node: Node, *operands: ConstantNode) -> Node:
+    """Constant computed by node from its constant operands.
+
+    node is returned unchanged if the computation fails, such as a division by zero, so
+    that the error is raised by eval as without simplification.
+    """
+    try:
+        value = node.func(*(operand.value for operand in operands))
+    except (ArithmeticError, ValueError):
+        return node
+    if isinstance(value, np.generic):
+        value = value.item()
+    return ConstantNode(value=value)
+
+
+def simplify(node: Node) -> Node:
+    """Simplified copy of the tree starting at node, sharing its unchanged subtrees.
+
+    Reserved names are replaced by their value, constant subtrees are folded, unary plus
+    and double negation are removed. Neutral operands such as in `x + 0` or `x * 1` are
+    kept, as they can change the dtype of the result, `True + 0` being an integer.
+    """
+    if isinstance(node, ConstantNode):
+        if isinstance(node.value, str) and node.value in RESERVED_NAME:
+            return ConstantNode(value=RESERVED_NAME[node.value])
+        return node
+
+    if isinstance(node, UnaryNode):
+        value = simplify(node.value)
+        if node.func_type == Operators.ID:
+            return value
+        if node.func_type == Operators.NEG and isinstance(value, UnaryNode):
+            if value.func_type == Operators.NEG:
+                return value.value
+        if value is not node.value:
+            node = UnaryNode(value=value, func_type=node.func_type)
+        if node.func_type in FOLDED and is_number(value):
+            return fold(node, value)
+        return node
+
+    if isinstance(node, BinaryNode):
+        left, right = simplify(node.left), simplify(node.right)
+        if left is not node.left or right is not node.right:
+            node = BinaryNode(left=left, right=right, func_type=node.func_type)
+        if node.func_type in FOLDED and is_number(left) and is_number(right):
+            return fold(node, left, right)
+        return node
+
+    return node
@@ -0,0 +1,104 @@
+"""Evaluate a tree over datasets too large for memory, one chunk of rows at a time"""
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+import pandas as pd
+
+from .base import Node
+
+# Default number of rows read at once
+CHUNK_SIZE = 100_000
+
+
+def read_chunks(
+    path: Union[str, Path],
+    columns: Optional[list[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Read a csv or parquet file by chunks of chunk_size rows, restricted to columns.
+
+    An empty list of columns reads the first column only, so that chunks keep the rows
+    of the file. Parquet files are read with pyarrow, which must be installed.
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None and not columns:
+            columns = parquet_file.schema_arrow.names[:1]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        if columns is not None and not columns:
+            columns = [0]
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+
+
+def stream_eval(
+    node: Node, chunks: Iterable[pd.DataFrame], *args, **kwargs
+) -> Iterator[pd.Series]:
+    """Evaluate node over each chunk of rows and yield the result of each chunk.
+
+    The tree is compiled once and its kernel reuses the same buffers for every chunk of
+    the same size, so that memory is bounded by the size of a chunk. Operators which
+    refer to other rows, such as delta, only see the rows of their chunk. The result of
+    a tree without variable is repeated on every row.
+    """
+    kernel = node.compile()
+    for chunk in chunks:
+        result = kernel(chunk, *args, **kwargs)
+        if not isinstance(result, pd.Series):
+            result = pd.Series(result, index=chunk.index)
+        yield result
+
+
+def write_chunks(
+    results: Iterable[pd.Series], path: Union[str, Path], name: str = "result"
+) -> int:
+    """Write result chunks as the column name of a csv or parquet file, return the rows.
+
+    Parquet files are written with pyarrow, which must be installed.
+    """
+    path = Path(path)
+    rows = 0
+    if path.suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for result in results:
+                frame = result.to_frame(name)
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(result)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    with open(path, "w", newline="") as file:
+        for result in results:
+            result.to_frame(name).to_csv(file, header=rows == 0, index=False)
+            rows += len(result)
+    return rows
+
+
+def eval_file(
+    node: Node,
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    chunk_size: int = CHUNK_SIZE,
+    *args,
+    **kwargs,
+) -> int:
+    """Evaluate node over a csv or parquet file and write the result to another one.
+
+    Only the columns referenced by node are read, by chunks of chunk_size rows, a tree
+    without variable being repeated on every row. Returns the number of rows written.
+    """
+    chunks = read_chunks(input_path, node.variables(), chunk_size)
+    return write_chunks(stream_eval(node, chunks, *args, **kwargs), output_path)
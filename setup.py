@@ -31,7 +31,7 @@ setup(
     description="Python Boilerplate contains all the boilerplate you need to create a Python package.",
     entry_points={
         'console_scripts': [
-            '_template=_template.cli:main',
+            'docstring_format=docstring_format.__main__:main',
         ],
     },
     install_requires=requirements,
@@ -0,0 +1,43 @@
+"""Test module"""
+import ast
+from unittest import TestCase
+
+from docstring_format.annotation_parser import parse_annotation, parse_returns, render_source
+
+
+def parse_function(source: str) -> ast.FunctionDef:
+    return ast.parse(source).body[0]
+
+
+class TestAnnotationParser(TestCase):
+    def test_annotations(self):
+        """Check the rendering of each kind of annotation node"""
+        source = ('def func(a: int | None, b: Callable[[int, str], bool], c: Literal[1, "x"], d: "pd.DataFrame",'
+                  ' e: Annotated[int, Field(gt=0)], f: Optional[None], g: tuple[int, ...],'
+                  ' h: typing.Literal["y"]) -> None: pass')
+        func = parse_function(source)
+        expected = ['int | None', 'Callable[[int, str], bool]', "Literal[1, 'x']", 'pd.DataFrame',
+                    'Annotated[int, Field(gt=0)]', 'Optional[None]', 'tuple[int, ...]', "typing.Literal['y']"]
+        self.assertEqual([parse_annotation(arg) for arg in func.args.args], expected)
+        self.assertEqual([parse_annotation(arg, source.splitlines()) for arg in func.args.args], expected)
+        self.assertIsNone(parse_returns(func))
+        self.assertIsNone(parse_returns(func, source.splitlines()))
+
+    def test_cache(self):
+        """Check that annotations repeated across functions are rendered once"""
+        lines = [f'def func_{n}(value: Optional[dict[str, "pd.Series"]]) -> dict[str, float]: pass'
+                 for n in range(10)]
+        functions = ast.parse('\n'.join(lines)).body
+        render_source.cache_clear()
+        annotations = [parse_annotation(func.args.args[0], lines) for func in functions]
+        returns = [parse_returns(func, lines) for func in functions]
+        self.assertEqual(set(annotations), {'Optional[dict[str, pd.Series]]'})
+        self.assertEqual(set(returns), {'dict[str, float]'})
+        self.assertEqual(render_source.cache_info().misses, 2)
+        self.assertIs(annotations[0], annotations[-1])
+
+    def test_multiline(self):
+        """Check that annotations written over several lines are rendered without the cache"""
+        lines = ['def func(value: Union[int,', '                   str]): pass']
+        func = ast.parse('\n'.join(lines)).body[0]
+        self.assertEqual(parse_annotation(func.args.args[0], lines), 'Union[int, str]')
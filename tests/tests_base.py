@@ -1,10 +1,14 @@
 """Test module"""
 import json
+import os
+import shutil
+import tempfile
+import threading
 from dataclasses import asdict
 from pathlib import Path
-from unittest import TestCase
+from unittest import TestCase, mock
 
-from docstring_format import Docstring, ScriptFile, SectionType
+from docstring_format import Docstring, ScriptFile, SectionType, cleaned_stats
 from docstring_format.base import (get_docstring_start_and_length,
                                    get_functions, parse_sections)
 
@@ -38,6 +42,24 @@ class TestFunctions(TestCase):
         functions = get_functions(raw_text)
         self.assertEqual([func.name for func in functions], self.results['get_functions'])
 
+    def test_nested_functions(self):
+        """Check if methods, nested and async functions are found in source order"""
+        raw_text = '\n'.join(['class A:',
+                               '    class B:',
+                               '        async def method(self):',
+                               '            """Docstring."""',
+                               '    def other(self):',
+                               '        pass',
+                               'if True:',
+                               '    def outer():',
+                               '        """Docstring."""',
+                               '        def inner():',
+                               '            """Docstring."""'])
+        functions = get_functions(raw_text)
+        self.assertEqual([func.name for func in functions], ['method', 'other', 'outer', 'inner'])
+        functions = get_functions(raw_text, with_docstring=True)
+        self.assertEqual([func.name for func in functions], ['method', 'outer', 'inner'])
+
 
 class TestDocstring(TestCase):
     def setUp(self) -> None:
@@ -68,6 +90,16 @@ class TestDocstring(TestCase):
                       for docstring in docstrings]
         self.assertEqual(docstrings, self.results['docstrings'])
 
+    def test_line_views(self):
+        """Check that docstrings and sections share the lines of the script"""
+        docstring = Docstring.from_ast(self.functions[0], self.lines)
+        self.assertIs(docstring.lines.source, self.lines)
+        self.assertEqual(docstring.lines, self.lines[docstring.start:docstring.start + docstring.length])
+        for section in docstring.sections:
+            self.assertIs(section.lines.source, self.lines)
+            self.assertEqual(section.lines, list(docstring.lines)[section.start:section.start + section.length])
+        self.assertFalse(hasattr(docstring, '__dict__'))
+
     def test_docstrings_cleaned(self):
         docstrings = [Docstring.from_ast(func, self.lines) for func in self.functions]
         cleaned = [docstring.cleaned for docstring in docstrings]
@@ -86,3 +118,103 @@ class TestScriptFile(TestCase):
         script = ScriptFile(self.file_path)
         cleaned = script.cleaned
         self.assertEqual(cleaned, self.results['script_cleaned'])
+
+    def test_form_feed(self):
+        """Check that lines are numbered as by ast, a form feed does not end a line"""
+        raw_text = 'x = 1\n\x0c\ndef f(a):\n    """Summary.\n\n    Parameters\n    ----------\n    a\n    """\n'
+        cleaned = ScriptFile('script.py', raw_text).cleaned_text
+        self.assertTrue(cleaned.startswith('x = 1\n\x0c\ndef f(a):\n    """\n    Summary.\n'))
+        self.assertEqual(ScriptFile('script.py', 'x = "a\x0cb"\n', line_ranges=[]).cleaned_text, 'x = "a\x0cb"\n')
+
+    def test_cleaned_memoized(self):
+        """Check that cleaned results are computed once and invalidated on modification"""
+        script = ScriptFile(self.file_path)
+        cleaned_stats(reset=True)
+        cleaned = script.cleaned
+        self.assertIs(script.cleaned, cleaned)
+        stats = cleaned_stats()
+        self.assertEqual(stats['script'], {'hits': 1, 'misses': 1})
+        self.assertEqual(stats['docstring']['misses'], len(script.docstrings))
+
+        docstring = script.docstrings[0]
+        section = docstring.sections[0]
+        section_cleaned = section.cleaned
+        section.lines = ['    """Other summary."""']
+        self.assertIsNot(section.cleaned, section_cleaned)
+        self.assertEqual(section.cleaned, ['    Other summary.'])
+        self.assertEqual(docstring.cleaned[1], '    Other summary.')
+        self.assertIsNot(script.cleaned, cleaned)
+        self.assertIn('    Other summary.', script.cleaned)
+
+        # lines cannot be modified in place, which would leave the results stale
+        with self.assertRaises(TypeError):
+            section.lines[0] = '    """Third summary."""'
+        with self.assertRaises(AttributeError):
+            section.lines.append('')
+        with self.assertRaises(TypeError):
+            script.lines[0] = ''
+
+        # a hit on the script does not clean its docstrings again
+        cleaned = script.cleaned
+        with mock.patch.object(Docstring, 'clean') as clean:
+            self.assertIs(script.cleaned, cleaned)
+        clean.assert_not_called()
+
+    def test_cleaned_stats_threads(self):
+        """Check that the hits and misses counted by concurrent threads are not lost"""
+        scripts = [ScriptFile(self.file_path) for _ in range(8)]
+        cleaned_stats(reset=True)
+
+        def clean(script):
+            for _ in range(200):
+                script.clean()
+
+        threads = [threading.Thread(target=clean, args=(script,)) for script in scripts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(cleaned_stats()['script'], {'hits': 8 * 199, 'misses': 8})
+
+    def test_write_clean(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = shutil.copy(self.file_path, directory)
+        script = ScriptFile(file_path)
+        script.write_clean()
+        self.assertEqual(Path(file_path.replace('.py', '_edit.py')).read_text(), script.cleaned_text)
+
+    def test_write_clean_in_place(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = shutil.copy(self.file_path, directory)
+        os.chmod(file_path, 0o640)
+        expected = ScriptFile(file_path).cleaned_text
+        self.assertTrue(ScriptFile(file_path).write_clean(in_place=True))
+        self.assertEqual(Path(file_path).read_text(), expected)
+        self.assertEqual(os.stat(file_path).st_mode & 0o777, 0o640)
+        self.assertEqual(os.listdir(directory), [os.path.basename(file_path)])
+
+        # symbolic links are kept, the file they point to is replaced
+        real_path = Path(directory) / 'real' / 'module.py'
+        real_path.parent.mkdir()
+        shutil.copy(self.file_path, real_path)
+        link_path = Path(directory) / 'link.py'
+        link_path.symlink_to(real_path)
+        self.assertTrue(ScriptFile(str(link_path)).write_clean(in_place=True))
+        self.assertTrue(link_path.is_symlink())
+        self.assertEqual(real_path.read_text(), expected)
+        self.assertEqual(sorted(os.listdir(real_path.parent)), ['module.py'])
+
+        # line terminators are kept
+        crlf_path = Path(directory) / 'crlf.py'
+        crlf_path.write_bytes(Path(self.file_path).read_bytes().replace(b'\n', b'\r\n'))
+        self.assertTrue(ScriptFile(str(crlf_path)).write_clean(in_place=True))
+        self.assertEqual(crlf_path.read_bytes(), expected.replace('\n', '\r\n').encode())
+
+        # clean scripts are not written again
+        clean_path = Path(directory) / 'clean.py'
+        clean_path.write_text('def function():\n    """\n    Summary.\n\n    """\n')
+        os.utime(clean_path, ns=(0, 0))
+        self.assertFalse(ScriptFile(str(clean_path)).write_clean(in_place=True))
+        self.assertEqual(os.stat(clean_path).st_mtime_ns, 0)
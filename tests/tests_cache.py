@@ -0,0 +1,41 @@
+"""Test module for the cache of cleaned scripts"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from docstring_format import DocstringStyle
+from docstring_format.cache import CleanCache
+
+
+class TestCleanCache(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = CleanCache(self.directory)
+
+    def test_get(self):
+        self.assertIsNone(self.cache.get('a = 1\n'))
+        self.cache.set('a = 1\n', 'b = 2\n')
+        self.assertEqual(self.cache.get('a = 1\n'), 'b = 2\n')
+
+    def test_already_clean(self):
+        self.cache.set('a = 1\n', 'a = 1\n')
+        self.assertEqual(self.cache.get('a = 1\n'), 'a = 1\n')
+
+    def test_key(self):
+        other = CleanCache(self.directory, style=DocstringStyle.GOOGLE)
+        self.assertNotEqual(self.cache.key('a = 1\n'), other.key('a = 1\n'))
+
+    def test_prune(self):
+        for n in range(3):
+            self.cache.set(f'a = {n}\n', f'b = {n}\n')
+            entry = os.path.join(self.directory, self.cache.key(f'a = {n}\n'))
+            os.utime(entry, (n, n))
+        self.cache.get('a = 0\n')  # refresh the oldest entry
+
+        self.cache.max_size = 2 * os.path.getsize(entry)
+        self.cache.prune()
+        self.assertEqual(self.cache.get('a = 0\n'), 'b = 0\n')
+        self.assertIsNone(self.cache.get('a = 1\n'))
+        self.assertEqual(self.cache.get('a = 2\n'), 'b = 2\n')
@@ -0,0 +1,70 @@
+"""Test module for the formatter daemon"""
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+
+from docstring_format import DocstringStyle, ScriptFile
+from docstring_format.daemon import FormatterServer, ScriptCache, request
+
+
+class TestDaemon(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file_path = shutil.copy('./dummy_tests_functions.py', self.directory)
+        self.socket_path = os.path.join(self.directory, 'daemon.sock')
+
+        server = FormatterServer(self.socket_path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(request, 'stop', socket_path=self.socket_path)
+
+    def test_format(self):
+        response = request('format', self.file_path, self.socket_path)
+        self.assertNotIn('error', response)
+        expected = ScriptFile(self.file_path).cleaned_text
+        self.assertEqual(Path(self.file_path.replace('.py', '_edit.py')).read_text(), expected)
+
+    def test_check(self):
+        response = request('check', self.file_path, self.socket_path)
+        self.assertEqual((response['function'], response['lineno']), ('function1', 5))
+        request('check', self.file_path, self.socket_path)
+        stats = request('stats', socket_path=self.socket_path)
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+        # modified files are parsed again
+        Path(self.file_path).write_text('a = 1\n')
+        response = request('check', self.file_path, self.socket_path)
+        self.assertIsNone(response['function'])
+        self.assertEqual(request('stats', socket_path=self.socket_path)['misses'], 2)
+
+    def test_error(self):
+        response = request('check', os.path.join(self.directory, 'missing.py'), self.socket_path)
+        self.assertIn('FileNotFoundError', response['error'])
+
+
+class TestScriptCache(TestCase):
+    def test_style(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = shutil.copy('./dummy_tests_functions.py', directory)
+        _, cleaned = ScriptCache(style=DocstringStyle.GOOGLE).get(file_path)
+        self.assertEqual(cleaned, ScriptFile(file_path, style=DocstringStyle.GOOGLE).cleaned_text)
+
+    def test_memory_budget(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        paths = [os.path.join(directory, f'{name}.py') for name in 'abc']
+        for path in paths:
+            Path(path).write_text('a = 1\n' * 100)
+
+        cache = ScriptCache(memory_budget=1500)
+        for path in paths:
+            cache.get(path)
+        self.assertEqual(list(cache.entries), paths[1:])
+        self.assertLessEqual(cache.size, cache.memory_budget)
@@ -0,0 +1,62 @@
+"""Test module for the cleaning of changed functions only"""
+from pathlib import Path
+from unittest import TestCase
+
+from docstring_format import ScriptFile
+from docstring_format.diff import parse_diff, parse_line_ranges
+
+DIFF = '''diff --git a/pkg/module.py b/pkg/module.py
+index 3b18e51..a9c0f4e 100644
+--- a/pkg/module.py
++++ b/pkg/module.py
+@@ -7 +7 @@ def function1(arg1: str):
+-    AZrojrltndflg
++    AZrojrltndflg lejkkjntgdf
+@@ -40,0 +41,3 @@ def function3(arg1: Optional[Iterable] = None) -> dict:
++    a
++    b
++    c
+@@ -60,2 +62,0 @@ def function4(arg1: Optional[Iterable] = None, arg2: Optional[tuple] = None) -> dict:
+-    a
+-    b
+diff --git a/removed.py b/removed.py
+deleted file mode 100644
+--- a/removed.py
++++ /dev/null
+@@ -1 +0,0 @@
+-a = 1
+'''
+
+
+class TestDiff(TestCase):
+    def test_parse_diff(self):
+        self.assertEqual(parse_diff(DIFF), {'pkg/module.py': [(7, 7), (41, 43), (62, 62)]})
+
+    def test_parse_line_ranges(self):
+        self.assertEqual(parse_line_ranges('10-20, 35'), [(10, 20), (35, 35)])
+
+
+class TestScriptFileLineRanges(TestCase):
+    def setUp(self) -> None:
+        self.file_path = './dummy_tests_functions.py'
+        self.raw_text = Path(self.file_path).read_text()
+
+    def test_no_range(self):
+        script = ScriptFile(self.file_path, line_ranges=[])
+        self.assertEqual(script.docstrings, [])
+        self.assertEqual(script.cleaned_text, self.raw_text)
+
+    def test_changed_function(self):
+        # lines of function2 signature and docstring
+        script = ScriptFile(self.file_path, line_ranges=[(25, 25)])
+        self.assertEqual([docstring.function.name for docstring in script.docstrings], ['function2'])
+
+        docstring = script.docstrings[0]
+        lines = self.raw_text.splitlines()
+        expected = [*lines[:docstring.start], *docstring.cleaned, *lines[docstring.start + docstring.length:]]
+        self.assertEqual(script.cleaned, expected)
+
+    def test_body_only(self):
+        # a change in the body of function1 does not affect its docstring
+        script = ScriptFile(self.file_path, line_ranges=[(17, 17)])
+        self.assertEqual(script.docstrings, [])
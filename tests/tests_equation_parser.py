@@ -0,0 +1,215 @@
+"""Test module for the equation parser"""
+import ast
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from equation_parser import BatchEvaluator, BatchReport, Node, eval_file, from_string, read_chunks, simplify
+from equation_parser.from_ast import eval_node
+
+
+def make_frames(length: int = 5) -> dict[str, pd.DataFrame]:
+    """Frames of the same columns with int and float dtypes, y is never zero"""
+    values = np.arange(length)
+    index = list('abcdefgh'[:length])
+    return {'int': pd.DataFrame({'x': values, 'y': values[::-1] + 1}, index=index),
+            'float': pd.DataFrame({'x': values * 0.5, 'y': values[::-1] + 1.5}, index=index)}
+
+
+class TestKernel(TestCase):
+    def assertSameResult(self, result, expected):
+        pd.testing.assert_series_equal(result, expected, check_names=False)
+
+    def test_dtypes(self):
+        """Check that the kernel computes the values and dtypes of eval"""
+        equations = ['x + 1', 'x * y', 'x - 2 * y', 'x ** 2', '-x + y', 'abs(-x)', 'x / y', 'sin(x) + y',
+                     '2 * pi * x', 'sqrt(x * x) + 1.5']
+        for name, frame in make_frames().items():
+            for equation in equations:
+                with self.subTest(frame=name, equation=equation):
+                    tree = from_string(equation)
+                    self.assertSameResult(tree.compile()(frame), tree.eval(frame))
+
+    def test_large_integers(self):
+        """Check that integers are not rounded through floating point"""
+        frame = pd.DataFrame({'x': [2 ** 60, 2 ** 60 + 1]})
+        tree = from_string('x + 1')
+        result = tree.compile()(frame)
+        self.assertSameResult(result, tree.eval(frame))
+        self.assertEqual(result.iloc[1], 2 ** 60 + 2)
+
+    def test_delta(self):
+        """Check operators which are not ufuncs, given Series along with the arguments of eval"""
+        for name, frame in make_frames().items():
+            for equation in ['delta(x)', 'delta(x) * 2', 'delta(x * y) + y']:
+                with self.subTest(frame=name, equation=equation):
+                    tree = from_string(equation)
+                    self.assertSameResult(tree.compile()(frame, 'b'), tree.eval(frame, 'b'))
+
+    def test_fold_errors(self):
+        """Check that constants which cannot be folded raise the errors of eval on each call"""
+        frame = make_frames()['float']
+        for equation, error in [('x + 1 / 0', ZeroDivisionError), ('-(1 / 0) * x', ZeroDivisionError),
+                                ('x * 10.0 ** 400', OverflowError)]:
+            tree = eval_node(ast.parse(equation, mode='eval').body)
+            kernel = tree.compile()
+            for name, func in [('eval', tree.eval), ('kernel', kernel), ('kernel again', kernel)]:
+                with self.subTest(equation=equation, func=name), self.assertRaises(error):
+                    func(frame)
+
+    def test_buffer_reuse(self):
+        """Check that buffers are reallocated across calls with different lengths or dtypes"""
+        tree = from_string('(x + 1) * (y - 2) + sin(x)')
+        kernel = tree.compile()
+        for length in [5, 3, 5, 8]:
+            for name, frame in make_frames(length).items():
+                with self.subTest(length=length, frame=name):
+                    first = kernel(frame)
+                    self.assertSameResult(first, tree.eval(frame))
+                    second = kernel(frame)
+                    self.assertSameResult(first, second)
+                    self.assertFalse(np.shares_memory(first.values, second.values))
+
+
+class TestFromString(TestCase):
+    def setUp(self) -> None:
+        from_string.cache_clear()
+        self.addCleanup(from_string.cache_clear)
+
+    def test_cache(self):
+        """Check that the same tree is returned for the same string, counted in cache_info"""
+        tree = from_string('x * 2 + y')
+        self.assertEqual(from_string.cache_info()[:2], (0, 1))
+        self.assertIs(from_string('x * 2 + y'), tree)
+        self.assertEqual(from_string.cache_info()[:2], (1, 1))
+        self.assertIsNot(from_string('x * 2 - y'), tree)
+        self.assertEqual(from_string.cache_info()[:2], (1, 2))
+
+    def test_frozen(self):
+        """Check that no node of a cached tree can be modified, unlike a tree built from its serialization"""
+        tree = from_string('-sin(x) * 2 + y')
+        nodes = [tree, tree.left, tree.left.left, tree.left.left.value, tree.left.right, tree.right]
+        for node in nodes:
+            for name in ['value', 'left', 'func_type', 'other']:
+                with self.subTest(node=node.__class__.__name__, name=name), self.assertRaises(AttributeError):
+                    setattr(node, name, None)
+        copy = Node.from_dict(tree.serialize())
+        copy.right.value = 'z'
+        copy.left.left.func_type = 'neg'
+        self.assertEqual(copy.right.value, 'z')
+        self.assertEqual(tree.right.value, 'y')
+        self.assertEqual(from_string('-sin(x) * 2 + y').serialize(), tree.serialize())
+
+    def test_debug_logging(self):
+        """Check that the ast is only dumped when debug messages are logged"""
+        self.addCleanup(structlog.reset_defaults)
+        with mock.patch('equation_parser.from_ast.ast.dump', return_value='') as dump:
+            structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.INFO))
+            from_string('x + 1')
+            dump.assert_not_called()
+            structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.DEBUG),
+                                logger_factory=structlog.ReturnLoggerFactory())
+            from_string('x + 2')
+            dump.assert_called_once()
+
+
+class TestBatchEvaluator(TestCase):
+    def test_eval(self):
+        """Check that each tree evaluates as by itself"""
+        batches = {(): ['sin(x) * y', 'sin(x) + 1', 'sin(x) * y - x ** 2', 'x'],
+                   ('c',): ['delta(x * y)', 'delta(x * y) - x', 'delta(x) + delta(y)']}
+        for args, equations in batches.items():
+            trees = [from_string(equation) for equation in equations]
+            batch = BatchEvaluator(trees)
+            for name, frame in make_frames().items():
+                for equation, tree, result in zip(equations, trees, batch.eval(frame, *args)):
+                    with self.subTest(frame=name, equation=equation):
+                        pd.testing.assert_series_equal(result, tree.eval(frame, *args), check_names=False)
+
+    def test_report(self):
+        """Check the counts of evaluations saved by common subexpressions"""
+        batch = BatchEvaluator([from_string('sin(a) * b'), from_string('sin(a) + c')])
+        self.assertEqual(batch.report, BatchReport(nodes=8, evaluations=6))
+        self.assertEqual(batch.report.saved, 2)
+
+    def test_duplicates(self):
+        """Check that trees of the same structure get results which can be modified independently"""
+        batch = BatchEvaluator([from_string('sin(x) * y'), Node.from_dict(from_string('sin(x) * y').serialize())])
+        self.assertEqual(batch.report, BatchReport(nodes=8, evaluations=4))
+        frame = make_frames()['float']
+        first, second = batch.eval(frame)
+        self.assertIsNot(first, second)
+        first.iloc[0] = 100.0
+        pd.testing.assert_series_equal(second, from_string('sin(x) * y').eval(frame), check_names=False)
+
+    def test_constant_types(self):
+        """Check that constants of different types are not shared"""
+        batch = BatchEvaluator([from_string('2 * a'), from_string('2.0 * a')])
+        self.assertEqual(batch.report, BatchReport(nodes=6, evaluations=5))
+        frame = pd.DataFrame({'a': [1, 2, 3]})
+        self.assertEqual([result.dtype for result in batch.eval(frame)], [np.int64, np.float64])
+
+
+class TestSimplify(TestCase):
+    def test_eval(self):
+        """Check that simplified trees evaluate to the values and dtypes of the trees as written"""
+        equations = ['x + 0', '0 + x', 'x - 0', 'x * 1', '1 * x', 'x / 1', 'x ** 1', 'x * 1.0', '+x', '-(-x)',
+                     '2 * 3 + x', 'x * (4 - 3)', 'x + 0 * y', '2 * pi * x', 'x ** (1 / 2)']
+        frames = make_frames()
+        frames['bool'] = frames['int'] % 2 == 0
+        for name, frame in frames.items():
+            for equation in equations:
+                with self.subTest(frame=name, equation=equation):
+                    tree = eval_node(ast.parse(equation, mode='eval').body)
+                    pd.testing.assert_series_equal(simplify(tree).eval(frame), tree.eval(frame), check_names=False)
+
+    def test_fold(self):
+        """Check that constant subtrees are folded, unless their computation fails"""
+        self.assertEqual(simplify(eval_node(ast.parse('2 * pi + 1', mode='eval').body)).serialize(),
+                         {'section_type': 'constant', 'value': 2 * np.pi + 1})
+        self.assertEqual(from_string('x / (1 - 1)').right.serialize(), {'section_type': 'constant', 'value': 0})
+        self.assertEqual(from_string('-(1 / 0)').value.func_type, 'div')
+
+
+class TestStreaming(TestCase):
+    def setUp(self) -> None:
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.input_path = self.directory / 'input.csv'
+        self.output_path = self.directory / 'output.csv'
+        self.frame = pd.DataFrame({'x': np.arange(8), 'y': np.linspace(1, 2, 8), 'z': list('abcdefgh')})
+        self.frame.to_csv(self.input_path, index=False)
+
+    def check_eval_file(self, equation: str, chunk_size: int):
+        tree = from_string(equation)
+        self.assertEqual(eval_file(tree, self.input_path, self.output_path, chunk_size), len(self.frame))
+        expected = tree.eval(self.frame)
+        if not isinstance(expected, pd.Series):
+            expected = pd.Series(expected, index=self.frame.index)
+        pd.testing.assert_series_equal(pd.read_csv(self.output_path)['result'], expected, check_names=False)
+
+    def test_eval_file(self):
+        """Check that a csv evaluated by chunks gives the values of eval"""
+        for equation in ['x * y + 1', 'x + 1', 'sin(x) * 2', 'y']:
+            for chunk_size in [3, 8, 100]:
+                with self.subTest(equation=equation, chunk_size=chunk_size):
+                    self.check_eval_file(equation, chunk_size)
+
+    def test_constant(self):
+        """Check that a tree without variable is written on every row"""
+        for chunk_size in [3, 100]:
+            with self.subTest(chunk_size=chunk_size):
+                self.check_eval_file('2 * pi + 1', chunk_size)
+
+    def test_read_chunks(self):
+        """Check that chunks are restricted to the columns, the first one if none is given"""
+        chunks = list(read_chunks(self.input_path, ['y', 'x'], 3))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 2])
+        self.assertEqual(list(chunks[0].columns), ['x', 'y'])
+        self.assertEqual([list(chunk.columns) for chunk in read_chunks(self.input_path, [], 5)], [['x'], ['x']])
@@ -0,0 +1,46 @@
+"""Test module for the profiling of the stages of the pipeline"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from docstring_format.base import get_functions
+from docstring_format.numpy_style import apply_numpy_style
+from docstring_format.profiling import ENV_VARIABLE, format_summary
+from docstring_format.runner import format_file
+
+ROOT = Path(__file__).parent.parent
+
+# profiling is enabled at import, it is run in a new interpreter
+PROFILED_RUN = '''
+import json, sys
+from docstring_format.profiling import summarize
+from docstring_format.runner import format_files
+print(json.dumps(summarize(format_files(sys.argv[1:], workers=2))))
+'''
+
+
+class TestProfiling(TestCase):
+    def test_disabled(self):
+        """Check that stages are not wrapped when profiling is disabled"""
+        self.assertNotIn(ENV_VARIABLE, os.environ)
+        for func in (get_functions, apply_numpy_style, format_file):
+            self.assertFalse(hasattr(func, '__wrapped__'))
+
+    def test_profile(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        files = [str(shutil.copy('./dummy_tests_functions.py', directory / name)) for name in ('a.py', 'b.py')]
+        output = subprocess.run([sys.executable, '-c', PROFILED_RUN, *files], capture_output=True, text=True,
+                                check=True, cwd=ROOT, env={**os.environ, ENV_VARIABLE: '1'}).stdout
+        summary = json.loads(output)
+        self.assertEqual(sorted(item['file'] for item in summary['files']), files)
+        self.assertEqual(set(summary['stages']), {'io', 'parse', 'sections', 'cleaning'})
+        self.assertEqual(summary['stages']['io']['calls'], 4)  # one read and one write per file
+        self.assertEqual(summary['stages']['parse']['calls'], 2)
+        table = format_summary(summary, top=1)
+        self.assertEqual(sum(file in table for file in files), 1)  # only the slowest file is listed
@@ -0,0 +1,108 @@
+"""Test module for the formatting of several files"""
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from docstring_format import ScriptFile
+from docstring_format.cache import CleanCache
+from docstring_format.runner import check_file, collect_files, format_files, format_many
+
+
+class TestRunner(TestCase):
+    def setUp(self) -> None:
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        for name in ('a.py', 'b.py', 'sub/c.py'):
+            file = self.directory / name
+            file.parent.mkdir(exist_ok=True)
+            shutil.copy('./dummy_tests_functions.py', file)
+        (self.directory / 'broken.py').write_text('def broken(:\n')
+
+    def test_collect_files(self):
+        files = collect_files([str(self.directory)])
+        names = [Path(file).relative_to(self.directory).as_posix() for file in files]
+        self.assertEqual(names, ['a.py', 'b.py', 'broken.py', 'sub/c.py'])
+
+    def test_format_files(self):
+        files = collect_files([str(self.directory)])
+        reports = format_files(files, workers=2)
+        self.assertEqual([report.file_path for report in reports], files)
+        self.assertEqual([report.ok for report in reports], [True, True, False, True])
+
+        expected = ScriptFile('./dummy_tests_functions.py').cleaned_text
+        self.assertEqual((self.directory / 'sub/c_edit.py').read_text(), expected)
+
+        # outputs of a previous run are not formatted again
+        self.assertNotIn(str(self.directory / 'a_edit.py'), collect_files([str(self.directory)]))
+
+    def test_format_files_in_place(self):
+        files = collect_files([str(self.directory)])
+        reports = format_files(files, workers=1, in_place=True)
+        self.assertEqual([report.ok for report in reports], [True, True, False, True])
+        self.assertEqual(list(self.directory.rglob('*_edit.py')), [])  # no edit file is written
+        expected = ScriptFile('./dummy_tests_functions.py').cleaned_text
+        self.assertEqual((self.directory / 'sub/c.py').read_text(), expected)
+
+    def test_format_files_line_terminators(self):
+        """Check that the line terminators of a script are kept, with or without in_place"""
+        file = self.directory / 'crlf.py'
+        file.write_bytes(Path('./dummy_tests_functions.py').read_bytes().replace(b'\n', b'\r\n'))
+        expected = ScriptFile('./dummy_tests_functions.py').cleaned_text.replace('\n', '\r\n').encode()
+        for in_place in (False, True):
+            with self.subTest(in_place=in_place):
+                reports = format_files([str(file)], workers=1, in_place=in_place)
+                self.assertTrue(reports[0].ok)
+                output = file if in_place else self.directory / 'crlf_edit.py'
+                self.assertEqual(output.read_bytes(), expected)
+
+    def test_check_files(self):
+        files = collect_files([str(self.directory)])
+        reports = format_files(files, workers=2, check=True)
+        self.assertEqual([(report.ok, report.function, report.lineno) for report in reports],
+                         [(True, 'function1', 5), (True, 'function1', 5), (False, None, None),
+                          (True, 'function1', 5)])
+        self.assertEqual(list(self.directory.rglob('*_edit.py')), [])  # nothing is written
+
+    def test_check_clean_file(self):
+        file = self.directory / 'clean.py'
+        file.write_text('\n'.join(['def function(arg1: int):',
+                                    '    """',
+                                    '    Summary.',
+                                    '',
+                                    '    Parameters',
+                                    '    ----------',
+                                    '    arg1 : int',
+                                    '        Value',
+                                    '',
+                                    '    """']))
+        self.assertTrue(check_file(str(file)).clean)
+
+    def test_format_many(self):
+        raw_text = Path('./dummy_tests_functions.py').read_text()
+        expected = ScriptFile('./dummy_tests_functions.py').cleaned_text
+        names = ('a.py', 'broken.py', 'b.py', 'c.py', 'd.py')
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                sources = ((name, raw_text if name != 'broken.py' else 'def broken(:\n') for name in names)
+                reports = list(format_many(sources, workers=workers, chunk_size=2))
+                self.assertEqual([report.name for report in reports], list(names))
+                self.assertEqual([report.ok for report in reports], [True, False, True, True, True])
+                self.assertEqual(reports[0].cleaned, expected)
+                self.assertTrue(reports[0].diff.startswith('--- a/a.py\n+++ b/a.py\n'))
+
+        # nothing is written and clean sources have an empty diff
+        self.assertEqual(sorted(path.relative_to(self.directory).as_posix() for path in self.directory.rglob('*')),
+                         ['a.py', 'b.py', 'broken.py', 'sub', 'sub/c.py'])
+        report = next(format_many([('clean.py', 'def function():\n    pass\n')]))
+        self.assertFalse(report.changed)
+
+    def test_format_many_prune(self):
+        """Check that the cache is pruned once the reports are consumed"""
+        cache = CleanCache(str(self.directory / 'cache'), max_size=0)
+        sources = [(f'{name}.py', f'def {name}():\n    """Summary."""\n') for name in 'abc']
+        reports = format_many(sources, cache=cache)
+        self.assertTrue(next(reports).changed)
+        self.assertEqual(len(list(cache.directory.iterdir())), 1)
+        self.assertEqual(len(list(reports)), 2)
+        self.assertEqual(list(cache.directory.iterdir()), [])
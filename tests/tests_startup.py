@@ -0,0 +1,47 @@
+"""Test module for the startup time of the entry points"""
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+ROOT = Path(__file__).parent.parent
+IMPORT_BUDGET = 50_000  # cumulative import time in us, generous to absorb the noise of a cold start
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Cumulative import time in us of each module imported by statement, measured with `python -X importtime`."""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True, cwd=ROOT).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(TestCase):
+    def test_package(self):
+        times = import_times('import docstring_format')
+        self.assertNotIn('docstring_format.base', times)
+        self.assertLess(times['docstring_format'], IMPORT_BUDGET)
+
+    def test_lazy_objects(self):
+        statement = 'import sys, docstring_format; docstring_format.ScriptFile; print(sorted(sys.modules))'
+        output = subprocess.run([sys.executable, '-c', statement], capture_output=True, text=True, check=True,
+                                cwd=ROOT).stdout
+        self.assertIn("'docstring_format.base'", output)
+
+    def test_daemon_client(self):
+        times = import_times('import docstring_format.daemon')
+        self.assertNotIn('docstring_format.base', times)
+        self.assertNotIn('typer', times)
+        self.assertLess(times['docstring_format.daemon'], IMPORT_BUDGET)
+
+    def test_command_line(self):
+        times = import_times('import docstring_format.__main__')
+        self.assertNotIn('docstring_format.base', times)
+        self.assertNotIn('concurrent.futures.process', times)
+        self.assertNotIn('typer', times)
+        self.assertLess(times['docstring_format.__main__'], IMPORT_BUDGET)
@@ -0,0 +1,74 @@
+"""Test module for the streaming cleaning of large scripts"""
+import io
+import mmap
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from docstring_format import ScriptFile
+from docstring_format.streaming import iter_docstring_spans, stream_clean, write_clean_streaming
+
+
+class TestStreaming(TestCase):
+    def setUp(self) -> None:
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.file_path = './dummy_tests_functions.py'
+
+    def stream(self, file_path, line_ranges=None) -> bytes:
+        output = io.BytesIO()
+        stream_clean(str(file_path), output, line_ranges)
+        return output.getvalue()
+
+    def test_stream_clean(self):
+        self.assertEqual(self.stream(self.file_path).decode(), ScriptFile(self.file_path).cleaned_text)
+
+    def test_line_ranges(self):
+        expected = ScriptFile(self.file_path, line_ranges=[(25, 25)]).cleaned_text
+        self.assertEqual(self.stream(self.file_path, [(25, 25)]).decode(), expected)
+
+    def test_line_ranges_decorators(self):
+        file = self.directory / 'decorated.py'
+        file.write_text('@decorator\ndef function(arg1: int):\n    """Summary.\n\n    Parameters\n    ----------\n'
+                        '    arg1: Value\n    """\n')
+        expected = ScriptFile(str(file), line_ranges=[(1, 1)]).cleaned_text
+        self.assertNotEqual(expected, file.read_text())
+        self.assertEqual(self.stream(file, [(1, 1)]).decode(), expected)
+
+    def test_line_terminators(self):
+        file = self.directory / 'crlf.py'
+        file.write_bytes(Path(self.file_path).read_bytes().replace(b'\n', b'\r\n').removesuffix(b'\r\n'))
+        expected = ScriptFile(self.file_path).cleaned_text.removesuffix('\n').replace('\n', '\r\n')
+        self.assertEqual(self.stream(file).decode(), expected)
+
+    def test_in_place(self):
+        file = self.directory / 'script.py'
+        shutil.copy(self.file_path, file)
+        self.assertTrue(write_clean_streaming(str(file), in_place=True))
+        self.assertEqual(file.read_text(), ScriptFile(self.file_path).cleaned_text)
+        mtime = file.stat().st_mtime_ns
+        self.assertFalse(write_clean_streaming(str(file), line_ranges=[(1, 1)], in_place=True))
+        self.assertEqual(file.stat().st_mtime_ns, mtime)
+        self.assertEqual([item.name for item in self.directory.iterdir()], ['script.py'])
+
+    def test_spans(self):
+        file = self.directory / 'spans.py'
+        file.write_text('\n'.join(['class A:',
+                                   '    @decorator(',
+                                   '        x)',
+                                   '    # comment',
+                                   '    @other',
+                                   '    async def method(self, arg=lambda: 1,',
+                                   '                     ) -> dict:  # comment',
+                                   '        """Docstring."""',
+                                   '        def inner(): """One liner."""',
+                                   '        def other():',
+                                   '            "Not" + "a docstring"',
+                                   'def last():',
+                                   '    """Docstring',
+                                   '    """']))
+        with open(file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            spans = [(span.start, span.def_line, span.def_col, span.header_last, span.first, span.last)
+                     for span in iter_docstring_spans(buffer)]
+        self.assertEqual(spans, [(2, 6, 4, 7, 8, 8), (12, 12, 0, 12, 13, 14)])
@@ -0,0 +1,125 @@
+"""Test module for the detection and rendering of docstring styles"""
+from unittest import TestCase
+
+from docstring_format import DocstringStyle, ScriptFile
+from docstring_format.styles import detect_style
+
+GOOGLE = ['def function(a: int, b) -> dict:',
+          '    """Summary.',
+          '',
+          '    Args:',
+          '        a (int): The a value.',
+          '        b: The b value,',
+          '            on two lines.',
+          '',
+          '    Returns:',
+          '        dict: The result.',
+          '    """']
+
+RST = ['def function(a: int, b) -> dict:',
+       '    """Summary.',
+       '',
+       '    :param a: The a value.',
+       '    :type a: int',
+       '    :param b: The b value,',
+       '        on two lines.',
+       '    :returns: The result.',
+       '    :rtype: dict',
+       '    """']
+
+NUMPY = ['def function(a: int, b) -> dict:',
+         '    """',
+         '    Summary.',
+         '',
+         '    Parameters',
+         '    ----------',
+         '    a : int',
+         '        The a value.',
+         '    b',
+         '        The b value,',
+         '        on two lines.',
+         '',
+         '    Returns',
+         '    -------',
+         '    dict',
+         '        The result.',
+         '',
+         '    """']
+
+GOOGLE_RAISES = ['def function(a: int, b) -> dict:',
+                 '    """Summary.',
+                 '',
+                 '    Args:',
+                 '        a (int): The a value.',
+                 '        b: The b value.',
+                 '',
+                 '            Second paragraph.',
+                 '',
+                 '    Raises:',
+                 '        ValueError: If a is negative.',
+                 '',
+                 '    Returns:',
+                 '        dict: The result.',
+                 '',
+                 '    Examples:',
+                 '        >>> function(1, 2)',
+                 '    """']
+
+
+def cleaned(lines: list[str]) -> list[str]:
+    """Expected cleaned lines: the summary on its own line and a blank line before the closing quotes"""
+    return [lines[0], '    """', '    Summary.', *lines[2:-1], '', '    """']
+
+
+class TestStyles(TestCase):
+    def test_detect_style(self):
+        self.assertEqual(detect_style(GOOGLE[1:]), DocstringStyle.GOOGLE)
+        self.assertEqual(detect_style(RST[1:]), DocstringStyle.RST)
+        self.assertEqual(detect_style(NUMPY[1:]), DocstringStyle.NUMPY)
+        self.assertEqual(detect_style(['    """Summary only."""']), DocstringStyle.NUMPY)
+
+    def test_render(self):
+        """Check that docstrings are rendered in any style, whatever their own style"""
+        for source in (GOOGLE, RST):
+            with self.subTest(source=source[3]):
+                script = ScriptFile('script.py', '\n'.join(source))
+                self.assertEqual(script.clean(DocstringStyle.NUMPY), NUMPY)
+                self.assertEqual(script.clean(DocstringStyle.GOOGLE), cleaned(GOOGLE))
+                self.assertEqual(script.clean(DocstringStyle.RST), cleaned(RST))
+
+    def test_idempotent(self):
+        """Check that a cleaned script is left unchanged by a second pass, in each style"""
+        returns_only = ['def function(a: int) -> dict:', '    """Summary.', '', '    Parameters', '    ----------',
+                        '    a', '', '    Returns', '    -------', '    """']
+        for source in (GOOGLE, RST, NUMPY, returns_only, GOOGLE_RAISES):
+            for style in DocstringStyle:
+                with self.subTest(source=source[3], style=style):
+                    cleaned = ScriptFile('script.py', '\n'.join(source)).clean(style)
+                    self.assertEqual(ScriptFile('script.py', '\n'.join(cleaned)).clean(style), cleaned)
+
+    def test_single_parse(self):
+        """Check that the sections parsed once are shared by all styles"""
+        script = ScriptFile('script.py', '\n'.join(GOOGLE), style=DocstringStyle.RST)
+        docstring = script.docstrings[0]
+        sections = docstring.sections
+        script.clean(DocstringStyle.NUMPY)
+        script.clean(DocstringStyle.GOOGLE)
+        self.assertIs(script.docstrings[0], docstring)
+        self.assertIs(docstring.sections, sections)
+        self.assertEqual(docstring.source_style, DocstringStyle.GOOGLE)
+        self.assertIn('    :rtype: dict', script.cleaned)
+
+    def test_other_sections(self):
+        """Check that google sections such as Raises are kept as written, and end the section before them"""
+        script = ScriptFile('script.py', '\n'.join(GOOGLE_RAISES))
+        self.assertEqual(script.clean(DocstringStyle.GOOGLE), cleaned(GOOGLE_RAISES))
+        self.assertEqual(script.clean(DocstringStyle.NUMPY),
+                         [*NUMPY[:9], '        The b value.', '', '        Second paragraph.', '',
+                          '    Raises:', '        ValueError: If a is negative.', *NUMPY[11:-2],
+                          '', '    Examples:', '        >>> function(1, 2)', '', '    """'])
+        for style in DocstringStyle:
+            with self.subTest(style=style):
+                lines = script.clean(style)
+                self.assertEqual([line for line in lines if line != line.rstrip()], [])
+                self.assertEqual(lines.count('    Raises:'), 1)
+                self.assertEqual(lines.count('        ValueError: If a is negative.'), 1)